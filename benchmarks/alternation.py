@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmarks.alternation
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Benchmark of matching the rules in :data:`inflection.PLURALS` and
+    :data:`inflection.SINGULARS` joined into one alternation, so that a
+    single match finds the first rule that matches a word, against trying
+    the rules one by one.  For reference it also times
+    :func:`inflection.pluralize` and :func:`inflection.singularize`, which
+    only try the rules indexed under the suffixes of the word and also apply
+    the replacement.  Checks that the alternation finds the same rule as the
+    loop and prints the time per word in nanoseconds.
+
+    Run it from the repository root with ``python -m benchmarks.alternation``.
+
+    :copyright: (c) 2012-2020 by Janne Vanhala
+
+    :license: MIT, see LICENSE for more details.
+"""
+import argparse
+import re
+import sys
+import timeit
+import typing
+
+import inflection
+from benchmarks.suite import NOUNS, PLURAL_NOUNS
+
+FOREIGN_NOUNS = [
+    'café', 'straße', 'Ærøskøbing', 'naïve', 'señora', 'crème', 'größe',
+    'Übung', 'niño', 'Ærøperson', 'Øx', 'smörgåsbord',
+]
+
+GLOBAL_FLAGS = re.compile(r'\(\?([aiLmsu]+)\)')
+
+
+def loop(
+    rules: inflection.RegexReplaceList
+) -> typing.Callable[[str], typing.Optional[int]]:
+    """Return a function that finds the first matching rule one by one."""
+    patterns = [re.compile(rule) for rule, _ in rules]
+
+    def find(word: str) -> typing.Optional[int]:
+        for position, pattern in enumerate(patterns):
+            if pattern.search(word):
+                return position
+        return None
+    return find
+
+
+def alternation(
+    rules: inflection.RegexReplaceList
+) -> typing.Callable[[str], typing.Optional[int]]:
+    """
+    Return a function that finds the first matching rule with one match of
+    all the rules joined into one alternation.  Each rule is a branch that
+    may start anywhere in the word, and the branches are tried in order, so
+    the first rule that matches anywhere wins, as in :func:`loop`.  The
+    default rules have no backreferences or named groups, which could not
+    be joined like this.
+    """
+    branches = []
+    positions = {}
+    group = 0
+    for position, (rule, _) in enumerate(rules):
+        flags = GLOBAL_FLAGS.match(rule)
+        if flags:
+            rule = '(?%s:%s)' % (flags.group(1), rule[flags.end():])
+        group += 1
+        positions[group] = position
+        group += re.compile(rule).groups
+        branches.append('(?s:.*?)(%s)' % rule)
+    pattern = re.compile('|'.join(branches))
+
+    def find(word: str) -> typing.Optional[int]:
+        match = pattern.match(word)
+        if match is None or match.lastindex is None:
+            return None
+        return positions[match.lastindex]
+    return find
+
+
+def ns_per_word(
+    function: typing.Callable[[str], object],
+    words: typing.Sequence[str],
+    repeat: int
+) -> float:
+    def run() -> None:
+        for word in words:
+            function(word)
+    timer = timeit.Timer(run)
+    loops, _ = timer.autorange()
+    return min(timer.repeat(repeat, loops)) / loops / len(words) * 1e9
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help='number of timings to take the best of (default: 5)',
+    )
+    args = parser.parse_args(argv)
+    print('%-24s %12s %12s %12s' % (
+        'ns/word', 'inflect', 'loop', 'alternation'
+    ))
+    for name, rules, inflect, words in [
+        ('plurals: nouns', inflection.PLURALS, inflection.pluralize, NOUNS),
+        (
+            'plurals: foreign nouns', inflection.PLURALS, inflection.pluralize,
+            FOREIGN_NOUNS
+        ),
+        (
+            'singulars: plurals', inflection.SINGULARS,
+            inflection.singularize, PLURAL_NOUNS
+        ),
+    ]:
+        find_in_loop = loop(rules)
+        find_in_alternation = alternation(rules)
+        for word in words:
+            assert find_in_loop(word) == find_in_alternation(word), word
+        print('%-24s %12.0f %12.0f %12.0f' % (
+            name,
+            ns_per_word(inflect, words, args.repeat),
+            ns_per_word(find_in_loop, words, args.repeat),
+            ns_per_word(find_in_alternation, words, args.repeat),
+        ))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
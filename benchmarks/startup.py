@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmarks.startup
+    ~~~~~~~~~~~~~~~~~~
+
+    Cold start benchmark: the time to import :mod:`inflection` in a fresh
+    interpreter, and the time of the first call of each function after the
+    import, which includes compiling whatever that function needs.  Prints
+    the median of several runs in milliseconds, next to those of the module
+    at an earlier git revision if one is given.
+
+    Run it from the repository root with e.g.
+    ``python -m benchmarks.startup --runs 20 --baseline v0.5.1``.  See
+    :mod:`benchmarks.suite` for the warm path.
+
+    :copyright: (c) 2012-2020 by Janne Vanhala
+
+    :license: MIT, see LICENSE for more details.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import typing
+
+CALLS = [
+    ('pluralize', "'category'"),
+    ('singularize', "'categories'"),
+    ('tableize', "'RawScaledScorer'"),
+    ('camelize', "'device_type'"),
+    ('underscore', "'DeviceType'"),
+    ('humanize', "'employee_salary'"),
+    ('titleize', "'x-men: the last stand'"),
+    ('parameterize', "'Donald E. Knuth'"),
+    ('transliterate', "'Ærøskøbing'"),
+]
+
+# json is imported last, as it imports re, which inflection needs too.
+CHILD = '''
+import time
+timings = {}
+start = time.perf_counter()
+import inflection
+timings['import'] = time.perf_counter() - start
+for name, argument in %r:
+    function = getattr(inflection, name)
+    argument = eval(argument)
+    start = time.perf_counter()
+    function(argument)
+    timings[name] = time.perf_counter() - start
+import json
+print(json.dumps(timings))
+''' % (CALLS,)
+
+
+def run(python: str, directory: str) -> typing.Dict[str, float]:
+    """
+    Return the timings of one fresh interpreter in seconds, importing
+    :mod:`inflection` from `directory`.
+    """
+    # Let the interpreter write and use bytecode files, so that compiling
+    # the source is not measured.
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    output = subprocess.run(
+        [python, '-c', CHILD],
+        check=True,
+        cwd=directory,
+        env=env,
+        stdout=subprocess.PIPE,
+    ).stdout
+    return typing.cast(typing.Dict[str, float], json.loads(output))
+
+
+def medians(
+    python: str, directory: str, runs: int
+) -> typing.Dict[str, float]:
+    """Return the median timings of `runs` interpreters in milliseconds."""
+    run(python, directory)  # Write the bytecode files.
+    timings = [run(python, directory) for _ in range(runs)]
+    return {
+        name: 1e3 * statistics.median(timing[name] for timing in timings)
+        for name in timings[0]
+    }
+
+
+def checkout(revision: str, directory: str) -> None:
+    """Write :mod:`inflection` as of the git `revision` to `directory`."""
+    source = subprocess.run(
+        ['git', 'show', '%s:inflection/__init__.py' % revision],
+        check=True,
+        stdout=subprocess.PIPE,
+    ).stdout
+    os.mkdir(os.path.join(directory, 'inflection'))
+    path = os.path.join(directory, 'inflection', '__init__.py')
+    with open(path, 'wb') as file:
+        file.write(source)
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument(
+        '--runs',
+        type=int,
+        default=20,
+        help='number of interpreters to start (default: 20)',
+    )
+    parser.add_argument(
+        '--python',
+        default=sys.executable,
+        help='interpreter to benchmark (default: this one)',
+    )
+    parser.add_argument(
+        '--baseline',
+        metavar='REVISION',
+        help='git revision to compare with, e.g. a release tag',
+    )
+    args = parser.parse_args(argv)
+    current = medians(args.python, os.getcwd(), args.runs)
+    baseline: typing.Dict[str, float] = {}
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as directory:
+            checkout(args.baseline, directory)
+            baseline = medians(args.python, directory, args.runs)
+    print('%-20s %10s %12s' % (
+        '', 'median ms', 'baseline ms' if baseline else ''
+    ))
+    for name, milliseconds in current.items():
+        print('%-20s %10.2f %12s' % (
+            name if name == 'import' else 'first ' + name,
+            milliseconds,
+            '%.2f' % baseline[name] if name in baseline else '',
+        ))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
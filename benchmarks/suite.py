@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmarks.suite
+    ~~~~~~~~~~~~~~~~
+
+    Benchmarks of every public conversion function over realistic corpora, and
+    of :func:`inflection.Inflector.pluralize` and
+    :func:`inflection.Inflector.singularize` with rule sets grown by 10, 100
+    and 1000 custom irregular words.  Prints the time and the peak memory
+    allocated per call for each case, and can save the results as a JSON
+    baseline or compare them with one saved earlier, e.g. by a previous
+    release.
+
+    Run it from the repository root with e.g.
+    ``python -m benchmarks.suite --save benchmarks/baseline.json`` and later
+    ``python -m benchmarks.suite --compare benchmarks/baseline.json``.
+    Timings depend on the machine, so only compare results from the same one.
+
+    :copyright: (c) 2012-2020 by Janne Vanhala
+
+    :license: MIT, see LICENSE for more details.
+"""
+import argparse
+import itertools
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+import typing
+
+import inflection
+
+NOUNS = [
+    'search', 'switch', 'fix', 'box', 'process', 'address', 'case', 'stack',
+    'wish', 'fish', 'jeans', 'category', 'query', 'ability', 'agency',
+    'movie', 'archive', 'index', 'wife', 'safe', 'half', 'move', 'salesperson',
+    'person', 'spokesman', 'woman', 'man', 'basis', 'diagnosis', 'datum',
+    'medium', 'analysis', 'node_child', 'child', 'experience', 'day',
+    'comment', 'foobar', 'newsletter', 'old_news', 'news', 'series',
+    'species', 'quiz', 'perspective', 'ox', 'photo', 'buffalo', 'tomato',
+    'dwarf', 'elf', 'information', 'equipment', 'criterion', 'mouse',
+    'vertex', 'matrix', 'status', 'octopus', 'cactus', 'sheep', 'bus',
+    'alias', 'shoe', 'horse', 'prize', 'edge', 'database', 'user', 'order',
+]
+PLURAL_NOUNS = [inflection.pluralize(noun) for noun in NOUNS]
+
+IDENTIFIERS = [
+    'Product', 'SpecialGuest', 'ApplicationController', 'Area51Controller',
+    'HTMLTidy', 'HTMLTidyGenerator', 'FreeBSD', 'HTML', 'DeviceTypeID',
+    'XMLHttpRequest', 'UserAccountSettings', 'OAuth2Token', 'IOError',
+    'PersonAddress', 'BlogPost', 'CamelOctopus', 'SQLAlchemyModel',
+    'JSONResponseParser', 'HttpClient', 'MyTableName', 'ABCTest', 'Address',
+]
+UNDERSCORED = [inflection.underscore(identifier) for identifier in IDENTIFIERS]
+
+TITLES = [
+    'man from the boondocks', 'x-men: the last stand',
+    "TheManWithoutAPast", 'raiders_of_the_lost_ark', 'Donald E. Knuth',
+    'Random text with *(bad)* characters', 'Allow_Under_Scores',
+    'Trailing bad characters!@#', '!@#Leading bad characters',
+    'Squeeze   separators', 'Test with + sign', "Über die Brücke",
+    'Ærøskøbing ferry schedule', 'naïve café_id', 'Crème brûlée recipes',
+    'Straße und Platz', 'Приве́т мир', 'ǅemal’s story', '東京 tower',
+    "Jean-Luc O'Brien", 'Mötley Crüe', 'Zoë Saldaña-Perez', 'Łódź Poland',
+]
+
+NON_ASCII_TITLES = [title for title in TITLES if max(title) > '\x7f']
+
+NUMBERS = list(range(-120, 1120, 7))
+
+RECORDS = [
+    {
+        'user_id': number,
+        'first_name': 'Ada',
+        'last_name': 'Lovelace',
+        'billing_address': {
+            'street_name': 'Main Street',
+            'postal_code': '00100',
+            'country_code': 'FI',
+        },
+        'order_items': [
+            {'product_id': item, 'unit_price': 10, 'item_count': 2}
+            for item in range(3)
+        ],
+    }
+    for number in range(20)
+]
+CAMEL_RECORDS = inflection.camelize_keys(RECORDS, False)
+
+RULE_SET_SIZES = (0, 10, 100, 1000)
+
+DISTINCT_SIZE = 1000
+
+
+_T = typing.TypeVar('_T')
+
+
+class Case(typing.NamedTuple):
+    name: str
+    run: typing.Callable[[], object]
+    calls: int
+
+
+class Result(typing.NamedTuple):
+    ns: float
+    bytes: float
+
+
+def invented_words(count: int) -> typing.List[str]:
+    """Return `count` distinct made-up words, such as ``'bakodu'``."""
+    syllables = [c + v for c in 'bdfgklmnprstvz' for v in 'aeiou']
+    words = (
+        ''.join(parts) for parts in itertools.product(syllables, repeat=3)
+    )
+    return list(itertools.islice(words, count))
+
+
+def grown_inflector(size: int) -> inflection.Inflector:
+    """Return the English rules with `size` irregular words added."""
+    inflector = inflection.Inflector(
+        inflection.PLURALS, inflection.SINGULARS, inflection.UNCOUNTABLES
+    )
+    inflector.add_irregulars(
+        (word, word + 'en') for word in invented_words(size)
+    )
+    return inflector
+
+
+def each(
+    name: str,
+    function: typing.Callable[[_T], object],
+    corpus: typing.Sequence[_T]
+) -> Case:
+    """Return a case that calls `function` on each item of `corpus`."""
+    def run() -> None:
+        for item in corpus:
+            function(item)
+    return Case(name, run, len(corpus))
+
+
+def batch(
+    name: str,
+    function: typing.Callable[[typing.Sequence[_T]], object],
+    corpus: typing.Sequence[_T]
+) -> Case:
+    """Return a case that calls `function` once on the whole `corpus`."""
+    return Case(name, lambda: function(corpus), len(corpus))
+
+
+def cases() -> typing.List[Case]:
+    """Return the benchmark cases in the order they are run."""
+    result = [
+        each('camelize', inflection.camelize, UNDERSCORED),
+        batch('camelize_many', inflection.camelize_many, UNDERSCORED),
+        each('camelize_keys', inflection.camelize_keys, RECORDS),
+        each('dasherize', inflection.dasherize, UNDERSCORED),
+        batch('dasherize_many', inflection.dasherize_many, UNDERSCORED),
+        each('humanize', inflection.humanize, TITLES),
+        batch('humanize_many', inflection.humanize_many, TITLES),
+        each('ordinal', inflection.ordinal, NUMBERS),
+        batch('ordinal_many', inflection.ordinal_many, NUMBERS),
+        each('ordinalize', inflection.ordinalize, NUMBERS),
+        batch('ordinalize_many', inflection.ordinalize_many, NUMBERS),
+        each('parameterize', inflection.parameterize, TITLES),
+        batch('parameterize_many', inflection.parameterize_many, TITLES),
+        each('pluralize', inflection.pluralize, NOUNS),
+        batch('pluralize_many', inflection.pluralize_many, NOUNS),
+        each('singularize', inflection.singularize, PLURAL_NOUNS),
+        batch('singularize_many', inflection.singularize_many, PLURAL_NOUNS),
+        each('tableize', inflection.tableize, IDENTIFIERS),
+        batch('tableize_many', inflection.tableize_many, IDENTIFIERS),
+        each('titleize', inflection.titleize, TITLES),
+        batch('titleize_many', inflection.titleize_many, TITLES),
+        each('transliterate', inflection.transliterate, TITLES),
+        batch('transliterate_many', inflection.transliterate_many, TITLES),
+        each(
+            'transliterate[non-ascii]', inflection.transliterate,
+            NON_ASCII_TITLES
+        ),
+        each('underscore', inflection.underscore, IDENTIFIERS),
+        batch('underscore_many', inflection.underscore_many, IDENTIFIERS),
+        each('underscore_keys', inflection.underscore_keys, CAMEL_RECORDS),
+    ]
+    # The corpora above repeat their items across calls; batches of distinct
+    # items show the gain of the batch functions when nothing repeats.
+    nouns = invented_words(DISTINCT_SIZE)
+    identifiers = [inflection.camelize(noun + '_type') for noun in nouns]
+    underscored = [inflection.underscore(name) for name in identifiers]
+    for name, corpus in [
+        ('camelize', underscored),
+        ('parameterize', identifiers),
+        ('pluralize', nouns),
+        ('underscore', identifiers),
+    ]:
+        function = getattr(inflection, name)
+        result.append(each('%s[distinct]' % name, function, corpus))
+        result.append(batch(
+            '%s_many[distinct]' % name, getattr(inflection, name + '_many'),
+            corpus
+        ))
+    for size in RULE_SET_SIZES:
+        inflector = grown_inflector(size)
+        result.append(each(
+            'pluralize[%d irregulars]' % size, inflector.pluralize, NOUNS
+        ))
+        result.append(each(
+            'singularize[%d irregulars]' % size, inflector.singularize,
+            PLURAL_NOUNS
+        ))
+    return result
+
+
+def measure(case: Case, repeat: int) -> Result:
+    """
+    Return the best time in nanoseconds and the peak memory allocated in
+    bytes, both per item of the corpus.
+    """
+    run = case.run
+    run()  # Compile the rules and fill any caches first.
+    timer = timeit.Timer(run)
+    loops, _ = timer.autorange()
+    best = min(timer.repeat(repeat, loops)) / loops
+
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        run()
+        peak = tracemalloc.get_traced_memory()[1] - start
+    finally:
+        tracemalloc.stop()
+    return Result(best * 1e9 / case.calls, peak / case.calls)
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument(
+        '-k', '--filter',
+        default='',
+        help='only run the cases whose name contains this text',
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help='number of timings to take the best of (default: 5)',
+    )
+    parser.add_argument(
+        '--save',
+        metavar='FILE',
+        help='save the results as a JSON baseline',
+    )
+    parser.add_argument(
+        '--compare',
+        metavar='FILE',
+        help='compare the results with a JSON baseline',
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.1,
+        help='relative slowdown reported as a regression (default: 0.1)',
+    )
+    args = parser.parse_args(argv)
+    baseline: typing.Dict[str, typing.Dict[str, float]] = {}
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)['results']
+
+    print('Python %s, inflection %s, C extension %s' % (
+        platform.python_version(), inflection.__version__,
+        'enabled' if inflection._SPEEDUPS else 'disabled'
+    ))
+    print('%-28s %12s %12s %10s' % ('case', 'ns/call', 'bytes/call', 'change'))
+    results = {}
+    regressions = 0
+    for case in cases():
+        if args.filter not in case.name:
+            continue
+        result = measure(case, args.repeat)
+        results[case.name] = result._asdict()
+        change = ''
+        if case.name in baseline:
+            ratio = result.ns / baseline[case.name]['ns'] - 1
+            change = '%+9.1f%%' % (100 * ratio)
+            if ratio > args.threshold:
+                change += ' !'
+                regressions += 1
+        print('%-28s %12.0f %12.1f %10s' % (
+            case.name, result.ns, result.bytes, change
+        ))
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({
+                'python': platform.python_version(),
+                'implementation': platform.python_implementation(),
+                'inflection': inflection.__version__,
+                'speedups': inflection._SPEEDUPS,
+                'results': results,
+            }, file, indent=2, sort_keys=True)
+            file.write('\n')
+    if regressions:
+        print('%d cases are more than %.0f%% slower than the baseline' % (
+            regressions, 100 * args.threshold
+        ))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmarks.threads
+    ~~~~~~~~~~~~~~~~~~
+
+    Stress test of :func:`inflection.Inflector.pluralize` and
+    :func:`inflection.Inflector.singularize` from many threads while another
+    thread keeps adding and removing an irregular word.  Prints the number of
+    conversions per second for each thread count and fails if any result is
+    neither the result before nor the one after a change of the rules.
+
+    Run it from the repository root with e.g.
+    ``python -m benchmarks.threads --threads 1,2,4,8``.
+    Throughput only scales with the thread count on a free-threaded build of
+    CPython.
+
+    :copyright: (c) 2012-2020 by Janne Vanhala
+
+    :license: MIT, see LICENSE for more details.
+"""
+import argparse
+import sys
+import threading
+import time
+import typing
+
+import inflection
+
+WORDS = [
+    'cactus', 'cacti', 'person', 'people', 'status', 'statuses', 'octopus',
+    'octopi', 'matrix', 'matrices', 'Sheep', 'equipment', 'CamelOctopus',
+    'wife', 'wives', 'quiz', 'quizzes', 'bus', 'buses', 'DeviceType',
+]
+
+
+def english() -> inflection.Inflector:
+    return inflection.Inflector(
+        inflection.PLURALS, inflection.SINGULARS, inflection.UNCOUNTABLES
+    )
+
+
+def valid_results() -> typing.Dict[str, typing.Set[str]]:
+    """Return the results for each word before and after the change."""
+    results: typing.Dict[str, typing.Set[str]] = {}
+    for changed in (False, True):
+        inflector = english()
+        if changed:
+            inflector.irregular('cactus', 'cacti')
+        for word in WORDS:
+            results.setdefault('p:' + word, set()).add(
+                inflector.pluralize(word)
+            )
+            results.setdefault('s:' + word, set()).add(
+                inflector.singularize(word)
+            )
+    return results
+
+
+def run(threads: int, seconds: float) -> typing.Tuple[int, int]:
+    """
+    Convert words in `threads` threads for `seconds` while the rules change,
+    and return the number of conversions and of invalid results.
+    """
+    inflector = english()
+    valid = valid_results()
+    stop = threading.Event()
+    counts = [0] * threads
+    invalid = [0] * threads
+
+    def convert(number: int) -> None:
+        while not stop.is_set():
+            for word in WORDS:
+                if inflector.pluralize(word) not in valid['p:' + word]:
+                    invalid[number] += 1
+                if inflector.singularize(word) not in valid['s:' + word]:
+                    invalid[number] += 1
+            counts[number] += 2 * len(WORDS)
+
+    def change() -> None:
+        while not stop.is_set():
+            inflector.irregular('cactus', 'cacti')
+            time.sleep(0.001)
+            del inflector.plurals[:2]
+            del inflector.singulars[:1]
+            time.sleep(0.001)
+
+    workers = [
+        threading.Thread(target=convert, args=(number,))
+        for number in range(threads)
+    ]
+    workers.append(threading.Thread(target=change))
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sum(counts), sum(invalid)
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument(
+        '--threads',
+        type=lambda value: [int(count) for count in value.split(',')],
+        default=[1, 2, 4, 8],
+        help='comma-separated thread counts (default: 1,2,4,8)',
+    )
+    parser.add_argument(
+        '--seconds',
+        type=float,
+        default=2.0,
+        help='duration of each run (default: 2)',
+    )
+    args = parser.parse_args(argv)
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print('Python %s, GIL %s' % (
+        sys.version.split()[0], 'enabled' if gil else 'disabled'
+    ))
+    failed = False
+    for threads in args.threads:
+        conversions, invalid = run(threads, args.seconds)
+        print('%3d threads: %10.0f conversions/s, %d invalid results' % (
+            threads, conversions / args.seconds, invalid
+        ))
+        failed = failed or invalid > 0
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,15 +9,129 @@
 
     :license: MIT, see LICENSE for more details.
 """
+import collections
+import functools
+import itertools
+import os
 import re
+import sys
+import time
 import typing
 import unicodedata
 
+# The locks of threading, without importing threading and what it imports.
+from _thread import RLock, allocate_lock as Lock
+
+try:
+    from inflection import _speedups
+except ImportError:  # pragma: no cover
+    _speedups = None  # type: ignore[assignment]
+
 __version__ = '0.5.1'
 
+# Whether to use the C implementations in ``_speedups`` for ASCII strings.
+_SPEEDUPS = _speedups is not None
+
+if sys.version_info >= (3, 7):
+    _is_ascii = str.isascii
+else:  # pragma: no cover
+    def _is_ascii(string: str) -> bool:
+        """Return whether ``string`` only has ASCII characters."""
+        return not string or max(string) < '\x80'
+
 RegexReplaceList = typing.List[typing.Tuple[str, str]]
 
-PLURALS: RegexReplaceList = [
+_Class = typing.TypeVar('_Class', bound=type)
+
+_T = typing.TypeVar('_T')
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    import mmap
+
+    import weakref
+
+    import numpy
+    import numpy.typing
+
+
+class _LazyPattern:
+    """
+    A regular expression that is compiled when it is first used rather than
+    when the module is imported.  On first use it replaces itself in the
+    module globals with the compiled pattern, so later uses cost nothing
+    extra.
+    """
+
+    def __init__(self, name: str, source: str) -> None:
+        self.name = name
+        self.source = source
+
+    def __getattr__(self, attribute: str) -> object:
+        compiled = globals()[self.name] = re.compile(self.source)
+        return getattr(compiled, attribute)
+
+
+def _lazy_compile(name: str, source: str) -> 're.Pattern[str]':
+    """Return a :class:`_LazyPattern` stored in the global ``name``."""
+    return typing.cast('re.Pattern[str]', _LazyPattern(name, source))
+
+
+class _Versioned:
+    """
+    Base class of rule containers that count their modifications, so that
+    compiled forms of the contents can tell when they have gone stale.  A
+    frozen container refuses modifications.
+    """
+
+    version = 0
+    frozen = False
+
+
+def _counts_modifications(
+    base: type, *names: str
+) -> typing.Callable[[_Class], _Class]:
+    """
+    Class decorator that wraps the methods `names` of `base` in the decorated
+    class, so that they bump ``version`` and raise :exc:`TypeError` when the
+    container is frozen.
+    """
+    def modifying(name: str) -> object:
+        def method(
+            self: _Versioned, *args: object, **kwargs: object
+        ) -> object:
+            if self.frozen:
+                raise TypeError('frozen rules cannot be modified')
+            result = getattr(base, name)(self, *args, **kwargs)
+            self.version += 1
+            return result
+        method.__name__ = name
+        return method
+
+    def decorate(cls: _Class) -> _Class:
+        for name in names:
+            setattr(cls, name, modifying(name))
+        return cls
+    return decorate
+
+
+@_counts_modifications(
+    list, '__setitem__', '__delitem__', '__iadd__', '__imul__', 'append',
+    'extend', 'insert', 'pop', 'remove', 'clear', 'reverse', 'sort'
+)
+class _RuleList(_Versioned, RegexReplaceList):
+    """A list of ``(rule, replacement)`` pairs counting its modifications."""
+
+
+@_counts_modifications(
+    set, '__ior__', '__iand__', '__isub__', '__ixor__', 'add', 'discard',
+    'remove', 'pop', 'clear', 'update', 'difference_update',
+    'intersection_update', 'symmetric_difference_update'
+)
+class _WordSet(_Versioned, typing.Set[str]):
+    """A set of words that counts its modifications."""
+
+
+PLURALS: RegexReplaceList = _RuleList([
     (r"(?i)(quiz)$", r'\1zes'),
     (r"(?i)^(oxen)$", r'\1'),
     (r"(?i)^(ox)$", r'\1en'),
@@ -41,9 +155,9 @@ PLURALS: RegexReplaceList = [
     (r"(?i)^(ax|test)is$", r'\1es'),
     (r"(?i)s$", 's'),
     (r"$", 's'),
-]
+])
 
-SINGULARS: RegexReplaceList = [
+SINGULARS: RegexReplaceList = _RuleList([
     (r"(?i)(database)s$", r'\1'),
     (r"(?i)(quiz)zes$", r'\1'),
     (r"(?i)(matr)ices$", r'\1ix'),
@@ -77,9 +191,9 @@ SINGULARS: RegexReplaceList = [
     (r"(?i)(n)ews$", r'\1ews'),
     (r"(?i)(ss)$", r'\1'),
     (r"(?i)s$", ''),
-]
+])
 
-UNCOUNTABLES: typing.Set[str] = {
+UNCOUNTABLES: typing.Set[str] = _WordSet({
     'equipment',
     'fish',
     'information',
@@ -88,7 +202,1318 @@ UNCOUNTABLES: typing.Set[str] = {
     'rice',
     'series',
     'sheep',
-    'species'}
+    'species'})
+
+
+class _Rule:
+    """
+    A compiled ``(rule, replacement)`` pair.  The regular expression is
+    compiled when the rule is first tried, as most rules are never tried on
+    a short run of words.
+    """
+
+    __slots__ = ('position', 'rule', 'pattern', 'replacement', 'template')
+
+    pattern: 're.Pattern[str]'
+
+    def __init__(self, position: int, rule: str, replacement: str) -> None:
+        self.position = position
+        self.rule = rule
+        self.replacement = replacement
+        self.template = _parse_template(replacement)
+
+    def __getattr__(self, name: str) -> 're.Pattern[str]':
+        # Only called while the ``pattern`` slot is still empty.
+        if name != 'pattern':
+            raise AttributeError(name)
+        self.pattern = re.compile(self.rule)
+        return self.pattern
+
+    def __getstate__(self) -> '_RuleState':
+        # Leave the pattern out, it is compiled again when first needed.
+        return self.position, self.rule, self.replacement, self.template
+
+    def __setstate__(self, state: '_RuleState') -> None:
+        self.position, self.rule, self.replacement, self.template = state
+
+    def substitute(self, match: 'typing.Match[str]', word: str) -> str:
+        """
+        Return ``self.pattern.sub(self.replacement, word)`` reusing ``match``,
+        the first match of the pattern in ``word``, when it is the only one.
+        """
+        start, end = match.span()
+        if (
+            self.template is not None and
+            end == len(word) and
+            (start == end or not self.pattern.match(word, end))
+        ):
+            return word[:start] + ''.join([
+                piece if isinstance(piece, str) else match.group(piece) or ''
+                for piece in self.template
+            ])
+        return self.pattern.sub(self.replacement, word)
+
+
+_Template = typing.Optional[typing.List[typing.Union[str, int]]]
+
+_RuleState = typing.Tuple[int, str, str, _Template]
+
+
+def _parse_template(replacement: str) -> _Template:
+    """
+    Split a replacement template into literal text and group numbers, e.g.
+    ``r"\1ies"`` into ``[1, "ies"]``.  Return ``None`` for templates with
+    escapes other than plain group references.
+    """
+    pieces: typing.List[typing.Union[str, int]] = []
+    position = 0
+    for reference in _GROUP_REFERENCE.finditer(replacement):
+        pieces.append(replacement[position:reference.start()])
+        pieces.append(int(reference.group(1) or reference.group(2)))
+        position = reference.end()
+    pieces.append(replacement[position:])
+    if any(isinstance(piece, str) and '\\' in piece for piece in pieces):
+        return None
+    return [piece for piece in pieces if piece != '']
+
+
+_GROUP_REFERENCE = _lazy_compile(
+    '_GROUP_REFERENCE', r'\\(?:g<([0-9]+)>|([1-9][0-9]?)(?![0-7]))'
+)
+
+
+class _CompiledForm:
+    """
+    Base class of the compiled forms of rule containers.  A compiled form
+    remembers the container it was compiled from and the container's stamp,
+    to tell when it has gone stale.
+    """
+
+    source: typing.Collection[object]
+    stamp: object
+
+    def is_current(self, source: typing.Collection[object]) -> bool:
+        return self.source is source and self.stamp == _stamp(source)
+
+    def attach(self, source: typing.Collection[object]) -> None:
+        """
+        Make this the compiled form of ``source``, an unchanged copy of the
+        container it was compiled from.
+        """
+        self.source = source
+        self.stamp = _stamp(source)
+
+
+class _CompiledRules(_CompiledForm):
+    """
+    A :data:`RegexReplaceList` with each rule compiled once.  Rules are tried
+    in order and the first one that matches the word wins.
+
+    Most rules require a literal suffix, e.g. ``(?i)(x|ch|ss|sh)es$`` can only
+    match words that end in ``es``.  The rules are indexed by that suffix in a
+    table of suffixes, see :func:`_suffix_table`, so a word is only tested
+    against the rules that could match it.
+
+    Rules for irregular words, as added by :meth:`Inflector.irregular`, are
+    not compiled at all.  They are kept in the table under the irregular
+    word, and found while looking up the candidate rules of a word.
+
+    The rules are copied when the compiled rules are made, but only parsed
+    and indexed when they are first used, so that e.g. the singular rules
+    cost nothing to a program that only pluralizes.
+
+    :param rules: the ``(rule, replacement)`` pairs to compile
+    """
+
+    regular: typing.Dict[int, _Rule]
+    index: '_SuffixTable'
+
+    def __init__(self, rules: RegexReplaceList) -> None:
+        self.source = rules
+        # Take the stamp before copying, so that a change made while copying
+        # makes the compiled rules stale rather than wrongly current.
+        self.stamp = _stamp(rules)
+        self.pairs = list(rules)
+        self._all_rules: typing.Optional[typing.List[_Rule]] = None
+
+    def __getattr__(self, name: str) -> object:
+        if name not in ('regular', 'index'):
+            raise AttributeError(name)
+        # Indexing twice in concurrent threads gives equivalent results.
+        regular: typing.Dict[int, _Rule] = {}
+        tails: typing.Dict[str, typing.List[int]] = {}
+        irregulars: typing.Dict[str, typing.List[_Irregular]] = {}
+        for position, (rule, replacement) in enumerate(self.pairs):
+            irregular = _Irregular.parse(position, rule, replacement)
+            if irregular is not None:
+                irregulars.setdefault(irregular.suffix, []).append(irregular)
+            else:
+                regular[position] = _Rule(position, rule, replacement)
+                tails.setdefault(_literal_tail(rule), []).append(position)
+        self.regular = regular
+        self.index = _suffix_table(tails, irregulars, regular)
+        return getattr(self, name)
+
+    def __getstate__(self) -> typing.Dict[str, object]:
+        # Save the index too, so that it is not built again when loaded.
+        self.index
+        state = self.__dict__.copy()
+        state['_all_rules'] = None
+        return state
+
+    def all_rules(self) -> typing.List[_Rule]:
+        """Return every rule compiled, including those for irregular words."""
+        rules = self._all_rules
+        if rules is None:
+            rules = self._all_rules = [
+                self.regular.get(position) or _Rule(position, *pair)
+                for position, pair in enumerate(self.pairs)
+            ]
+        return rules
+
+    def compile_all(self) -> None:
+        """Compile the regular expression of every rule now."""
+        for rule in self.all_rules():
+            rule.pattern
+
+    def lookup(
+        self, word: str
+    ) -> typing.Tuple[typing.Sequence[_Rule], typing.Optional['_Irregular']]:
+        """
+        Return the compiled rules that could match ``word``, in order, and the
+        first rule for an irregular word that matches ``word``, if any.
+        """
+        # ``$`` also matches before a trailing newline, so such words are
+        # tested against every rule.
+        if word.endswith('\n'):
+            return self.all_rules(), None
+        if not _is_ascii(word):
+            return self._lookup_folded(word)
+        index = self.index
+        rules = index[''][0]
+        irregular = None
+        lower = word.lower()
+        for start in range(len(lower) - 1, -1, -1):
+            entry = index.get(lower[start:])
+            if entry is None:
+                break
+            rules = entry[0]
+            for candidate in entry[1]:
+                if candidate.matches(word[start]):
+                    if irregular is None or (
+                        candidate.position < irregular.position
+                    ):
+                        irregular = candidate
+                    break
+        return rules, irregular
+
+    def _lookup_folded(
+        self, word: str
+    ) -> typing.Tuple[typing.Sequence[_Rule], None]:
+        """
+        Return the compiled rules that could match the non-ASCII ``word``, in
+        order, including those for irregular words.  The suffixes of the word
+        are looked up with the letters that ASCII letters match
+        case-insensitively, like ``ſ`` and ``K``, folded to those letters.
+        """
+        index = self.index
+        rules = index[''][0]
+        irregulars: typing.List[_Irregular] = []
+        folded = word.translate(_CASE_FOLDS)
+        for start in range(len(folded) - 1, -1, -1):
+            entry = index.get(folded[start:])
+            if entry is None:
+                break
+            rules = entry[0]
+            irregulars.extend(
+                candidate for candidate in entry[1]
+                if candidate.matches(word[start])
+            )
+        if not irregulars:
+            return rules, None
+        # Irregular words are compared as ASCII strings, so their regular
+        # expressions are tested instead.
+        all_rules = self.all_rules()
+        merged = list(rules)
+        merged.extend(
+            all_rules[candidate.position] for candidate in irregulars
+        )
+        merged.sort(key=lambda rule: rule.position)
+        return merged, None
+
+    def apply(self, word: str) -> str:
+        candidates, irregular = self.lookup(word)
+        for rule in candidates:
+            if irregular is not None and rule.position > irregular.position:
+                break
+            match = rule.pattern.search(word)
+            if match:
+                return rule.substitute(match, word)
+        if irregular is not None:
+            return irregular.substitute(word)
+        return word
+
+    def trace(
+        self, word: str
+    ) -> typing.Tuple[str, typing.List[typing.Tuple[int, bool, float]]]:
+        """
+        Apply the rules to ``word`` like :meth:`apply`, and also return the
+        rules tried as ``(position, matched, seconds)`` triples, in order.
+        """
+        clock = time.perf_counter
+        tried = []
+        candidates, irregular = self.lookup(word)
+        for rule in candidates:
+            if irregular is not None and rule.position > irregular.position:
+                break
+            start = clock()
+            match = rule.pattern.search(word)
+            if match:
+                result = rule.substitute(match, word)
+                tried.append((rule.position, True, clock() - start))
+                return result, tried
+            tried.append((rule.position, False, clock() - start))
+        if irregular is not None:
+            start = clock()
+            result = irregular.substitute(word)
+            tried.append((irregular.position, True, clock() - start))
+            return result, tried
+        return word, tried
+
+    def apply_many(self, words: typing.Sequence[str]) -> typing.List[str]:
+        """
+        Apply the rules to each word in ``words``.  Words that share the same
+        candidate rules are grouped, and each rule is tried on the whole group
+        at once.
+        """
+        groups: typing.Dict[
+            int, typing.Tuple[typing.Sequence[_Rule], typing.List[int]]
+        ] = {}
+        results = list(words)
+        for position, word in enumerate(words):
+            candidates, irregular = self.lookup(word)
+            if irregular is not None:
+                results[position] = self.apply(word)
+                continue
+            groups.setdefault(id(candidates), (candidates, []))[1].append(
+                position
+            )
+        for candidates, pending in groups.values():
+            for rule in candidates:
+                search = rule.pattern.search
+                unmatched = []
+                for position in pending:
+                    match = search(words[position])
+                    if match:
+                        results[position] = rule.substitute(
+                            match, words[position]
+                        )
+                    else:
+                        unmatched.append(position)
+                pending = unmatched
+                if not pending:
+                    break
+        return results
+
+
+class _Irregular:
+    """
+    A rule for an irregular word, as made by :meth:`Inflector.irregular`, that
+    is matched by comparing strings instead of a regular expression.  The
+    rule matches ASCII words that end in ``suffix`` ignoring case, and whose
+    letter at the start of the suffix is ``first`` if it is given.  The
+    suffix is replaced with ``text``, after the original first letter if
+    ``first`` is not given.
+    """
+
+    __slots__ = ('position', 'suffix', 'first', 'text')
+
+    def __init__(
+        self,
+        position: int,
+        suffix: str,
+        first: typing.Optional[str],
+        text: str
+    ) -> None:
+        self.position = position
+        self.suffix = suffix
+        self.first = first
+        self.text = text
+
+    @classmethod
+    def parse(
+        cls, position: int, rule: str, replacement: str
+    ) -> typing.Optional['_Irregular']:
+        """
+        Return the irregular word rule equivalent to ``rule`` and
+        ``replacement``, or ``None`` if they are not of the two forms made by
+        :func:`_irregular_rules`, e.g. ``(?i)(p)erson$`` with ``\\1eople``,
+        and ``c[oO][wW]$`` with ``kine``.
+        """
+        match = _KEEP_FIRST_LETTER.fullmatch(rule)
+        if match:
+            text = _AFTER_FIRST_LETTER.fullmatch(replacement)
+            if text:
+                suffix = (match.group(1) + match.group(2)).lower()
+                return cls(position, suffix, None, text.group(1))
+            return None
+        match = _REPLACE_WORD.fullmatch(rule)
+        if match and '\\' not in replacement:
+            first, letters = match.groups()
+            if all(
+                pair[2] == pair[1].upper() for pair in letters.split(']')[:-1]
+            ):
+                suffix = first.lower() + letters[1::4]
+                return cls(position, suffix, first, replacement)
+        return None
+
+    def __reduce__(self) -> typing.Tuple[
+        typing.Type['_Irregular'],
+        typing.Tuple[int, str, typing.Optional[str], str]
+    ]:
+        # Pickle compactly, a large rule set has thousands of these.
+        return _Irregular, (self.position, self.suffix, self.first, self.text)
+
+    def matches(self, first: str) -> bool:
+        return self.first is None or first == self.first
+
+    def substitute(self, word: str) -> str:
+        start = len(word) - len(self.suffix)
+        if self.first is None:
+            start += 1
+        return word[:start] + self.text
+
+
+_KEEP_FIRST_LETTER = _lazy_compile(
+    '_KEEP_FIRST_LETTER', r'\(\?i\)\(([A-Za-z0-9])\)([A-Za-z0-9]*)\$'
+)
+
+_AFTER_FIRST_LETTER = _lazy_compile(
+    '_AFTER_FIRST_LETTER', r'\\1([^\\0-9][^\\]*|)'
+)
+
+_REPLACE_WORD = _lazy_compile(
+    '_REPLACE_WORD', r'([A-Za-z0-9])((?:\[[a-z0-9][A-Z0-9]\])*)\$'
+)
+
+
+_SuffixTable = typing.Dict[
+    str, typing.Tuple[typing.Sequence[_Rule], typing.Tuple[_Irregular, ...]]
+]
+
+
+def _suffix_table(
+    tails: typing.Mapping[str, typing.List[int]],
+    irregulars: typing.Mapping[str, typing.List[_Irregular]],
+    rules: typing.Mapping[int, _Rule]
+) -> _SuffixTable:
+    """
+    Return a table from each suffix of the literal tails of ``rules`` and of
+    the suffixes of ``irregulars``, including the empty suffix, to the rules
+    whose tail is a suffix of it, in rule order, and to the irregular rules
+    whose suffix it is.  A suffix is only in the table if its shorter
+    suffixes are, so a lookup can stop at the first suffix of a word that is
+    missing.  The table only holds built-in types, so it pickles fast.
+
+    :param tails: the positions of ``rules`` by their literal tail
+    :param irregulars: the rules for irregular words by their suffix
+    :param rules: the compiled rules by their position
+    """
+    suffixes = {''}
+    for suffix in itertools.chain(tails, irregulars):
+        for start in range(len(suffix)):
+            if suffix[start:] in suffixes:
+                break
+            suffixes.add(suffix[start:])
+    table: _SuffixTable = {}
+    matching: typing.Sequence[_Rule]
+    for suffix in sorted(suffixes, key=len):
+        inherited = table[suffix[1:]][0] if suffix else ()
+        positions = tails.get(suffix)
+        if positions:
+            matching = [
+                rules[position] for position in sorted(
+                    [rule.position for rule in inherited] + positions
+                )
+            ]
+        else:
+            # Suffixes without rules of their own share the list of the next
+            # shorter suffix.
+            matching = inherited
+        table[suffix] = matching, tuple(irregulars.get(suffix, ()))
+    return table
+
+
+def _literal_tail(rule: str) -> str:
+    """
+    Return the lowercased literal text that every match of the regular
+    expression ``rule`` ends with at the end of the word, e.g. ``"ies"`` for
+    ``"(?i)([^aeiouy]|qu)ies$"``.  Return an empty string if there is no such
+    text or the rule is too complex to tell.
+    """
+    flags = re.match(r'\(\?([a-zA-Z]+)\)', rule)
+    if flags:
+        if not set(flags.group(1)) <= set('aiLsu'):
+            return ''
+        rule = rule[flags.end():]
+    branches = _regex_branches(rule)
+    if not branches or len(branches) > 1:
+        return ''
+    atoms = branches[0]
+    if not atoms or atoms[-1] != '$':
+        return ''
+    return _literal_suffix(atoms[:-1])[0]
+
+
+def _regex_branches(
+    pattern: str
+) -> typing.Optional[typing.List[typing.List[str]]]:
+    """
+    Split a regular expression into its top-level alternatives and those into
+    atoms: characters, escapes, character sets, groups and quantifiers.
+    Return ``None`` if the pattern cannot be split.
+    """
+    branches: typing.List[typing.List[str]] = [[]]
+    position = 0
+    while position < len(pattern):
+        char = pattern[position]
+        if char == '\\':
+            end = _escape_end(pattern, position)
+        elif char == '[':
+            end = _set_end(pattern, position)
+        elif char == '(':
+            end = _group_end(pattern, position)
+        elif char == '{':
+            end = pattern.find('}', position) + 1
+        elif char == '|':
+            branches.append([])
+            position += 1
+            continue
+        else:
+            end = position + 1
+        if end <= position or end > len(pattern):
+            return None
+        branches[-1].append(pattern[position:end])
+        position = end
+    return branches
+
+
+def _escape_end(pattern: str, start: int) -> int:
+    """
+    Return the end of the escape sequence at ``start`` in ``pattern``, which
+    can be longer than two characters, e.g. ``\\x65`` or ``\\145``.
+    """
+    match = _ESCAPE.match(pattern, start)
+    return match.end() if match else -1
+
+
+_ESCAPE = _lazy_compile(
+    '_ESCAPE',
+    r'(?s)\\(?:x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|N\{[^}]*\}'
+    r'|0[0-7]{0,2}|[1-7][0-7]{2}|[1-9][0-9]?|.)'
+)
+
+
+def _set_end(pattern: str, start: int) -> int:
+    position = start + 1
+    if pattern.startswith('^', position):
+        position += 1
+    if pattern.startswith(']', position):
+        position += 1
+    while position < len(pattern):
+        if pattern[position] == '\\':
+            position += 2
+        elif pattern[position] == ']':
+            return position + 1
+        else:
+            position += 1
+    return -1
+
+
+def _group_end(pattern: str, start: int) -> int:
+    depth = 0
+    position = start
+    while position < len(pattern):
+        char = pattern[position]
+        if char == '\\':
+            position += 2
+            continue
+        if char == '[':
+            position = _set_end(pattern, position)
+            if position < 0:
+                return -1
+            continue
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if not depth:
+                return position + 1
+        position += 1
+    return -1
+
+
+def _literal_suffix(atoms: typing.List[str]) -> typing.Tuple[str, bool]:
+    """
+    Return the lowercased literal text at the end of ``atoms`` and whether
+    all of the atoms are literal.
+    """
+    parts = []
+    for atom in reversed(atoms):
+        literal = _literal_atom(atom)
+        if literal is not None:
+            parts.append(literal)
+            continue
+        body = re.match(r'\((?:\?:|\?P<\w+>)?(.*)\)$', atom, re.DOTALL)
+        if body and not body.group(1).startswith('?'):
+            branches = _regex_branches(body.group(1))
+            if branches is not None:
+                suffixes = [_literal_suffix(branch) for branch in branches]
+                text = _common_suffix([text for text, _ in suffixes])
+                parts.append(text)
+                if all(complete and len(branch_text) == len(text)
+                       for branch_text, complete in suffixes):
+                    continue
+        return ''.join(reversed(parts)), False
+    return ''.join(reversed(parts)), True
+
+
+def _common_suffix(texts: typing.List[str]) -> str:
+    suffix = texts[0]
+    for text in texts[1:]:
+        while not text.endswith(suffix):
+            suffix = suffix[1:]
+    return suffix
+
+
+def _literal_atom(atom: str) -> typing.Optional[str]:
+    """
+    Return the lowercased character matched by ``atom`` if it matches a
+    single ASCII character, ignoring case.  Return ``None`` otherwise.
+    """
+    if atom.startswith('\\'):
+        # Only an escaped punctuation character is a literal, not e.g. \d
+        # or \x65.
+        if len(atom) != 2 or atom[1].isalnum():
+            return None
+        atom = atom[1]
+    elif atom.startswith('[') and atom.endswith(']') and len(atom) > 2:
+        if atom[1] == '^':
+            return None
+        chars = set(atom[1:-1])
+        if len(chars) > 2 or len(set(atom[1:-1].lower())) != 1:
+            return None
+        atom = atom[1].lower()
+        if not atom.isalpha() and len(chars) > 1:
+            return None
+    elif atom in _REGEX_SPECIAL:
+        return None
+    if len(atom) != 1 or not _is_ascii(atom):
+        return None
+    return atom.lower()
+
+
+_REGEX_SPECIAL = frozenset('.^$*+?{}[]|()')
+
+# Each letter that an ASCII letter matches case-insensitively, to that
+# letter lowercased.
+_CASE_FOLDS = str.maketrans(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZ\u0130\u0131\u017f\u212a',
+    'abcdefghijklmnopqrstuvwxyziisk',
+)
+
+
+class _UncountableIndex(_CompiledForm):
+    """
+    A set of uncountable words that answers whether a word, or the last word
+    in a string, is uncountable with one lookup per distinct word length.
+
+    :param words: the uncountable words
+    """
+
+    def __init__(self, words: typing.Set[str]) -> None:
+        self.source = words
+        self.stamp = _stamp(words)
+        self.words = frozenset(word.lower() for word in frozenset(words))
+        self.lengths = sorted({len(word) for word in self.words})
+
+    def __contains__(self, word: str) -> bool:
+        return word.lower() in self.words
+
+    def ends(self, word: str) -> bool:
+        """
+        Return whether ``word`` ends in a whole uncountable word, like
+        ``re.search(r'(?i)\\b(%s)\\Z' % uncountable, word)`` for any of them.
+        """
+        # Fold the letters that ASCII letters match case-insensitively, like
+        # ``ſ``, which lowercasing leaves as they are.
+        lower = (
+            word.lower() if _is_ascii(word)
+            else word.translate(_CASE_FOLDS).lower()
+        )
+        if len(lower) != len(word):
+            return any(
+                re.search(r'(?i)\b(%s)\Z' % re.escape(uncountable), word)
+                for uncountable in self.words
+            )
+        for length in self.lengths:
+            if length > len(lower):
+                break
+            start = len(lower) - length
+            if lower[start:] in self.words and (
+                _is_word_char(lower[start - 1:start]) !=
+                _is_word_char(lower[start:start + 1])
+            ):
+                return True
+        return False
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def _stamp(container: typing.Collection[object]) -> object:
+    version = getattr(container, 'version', None)
+    if version is None:
+        # A plain container cannot tell us whether it changed, compare the
+        # contents.
+        return tuple(container)
+    return version
+
+
+class _Snapshot(typing.NamedTuple):
+    """
+    The compiled rules of an :class:`Inflector` at one point in time.  A
+    snapshot is never modified, so any number of threads can use it at once.
+    """
+
+    key: typing.Tuple[object, ...]
+    plurals: _CompiledRules
+    singulars: _CompiledRules
+    uncountables: _UncountableIndex
+
+
+def _snapshot_key(
+    plurals: RegexReplaceList,
+    singulars: RegexReplaceList,
+    uncountables: typing.Set[str]
+) -> typing.Tuple[object, ...]:
+    return (
+        plurals, _stamp(plurals),
+        singulars, _stamp(singulars),
+        uncountables, _stamp(uncountables),
+    )
+
+
+class RuleStats(typing.NamedTuple):
+    """
+    How often one rule was tried and matched, as returned by
+    :func:`rule_stats`.  ``rules`` is ``'plurals'`` or ``'singulars'``, and
+    ``time`` the total number of seconds spent trying the rule.
+    """
+
+    rules: str
+    rule: str
+    replacement: str
+    evaluations: int
+    matches: int
+    time: float
+
+
+class Explanation(typing.NamedTuple):
+    """
+    How a word was inflected, as returned by :func:`explain`.  ``tried``
+    holds the ``(rule, replacement)`` pairs tested in order, and ``winner``
+    the one that matched, or ``None`` if no rule matched or the word is
+    uncountable.
+    """
+
+    word: str
+    result: str
+    uncountable: bool
+    tried: RegexReplaceList
+    winner: typing.Optional[typing.Tuple[str, str]]
+
+
+class _RuleCounters:
+    """
+    The evaluation and match counts and the time of each rule, keyed by
+    ``(rules, rule, replacement)`` so that they survive changes to the rules.
+    """
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.counts: typing.Dict[typing.Tuple[str, str, str], typing.List[
+            typing.Union[int, float]
+        ]] = {}
+
+    def record(
+        self,
+        rules: str,
+        compiled: '_CompiledRules',
+        tried: typing.List[typing.Tuple[int, bool, float]]
+    ) -> None:
+        with self.lock:
+            for position, matched, seconds in tried:
+                key = (rules,) + compiled.pairs[position]
+                counts = self.counts.get(key)
+                if counts is None:
+                    counts = self.counts[key] = [0, 0, 0.0]
+                counts[0] += 1
+                counts[1] += matched
+                counts[2] += seconds
+
+    def stats(self) -> typing.List[RuleStats]:
+        with self.lock:
+            stats = [
+                RuleStats(
+                    rules, rule, replacement,
+                    int(counts[0]), int(counts[1]), float(counts[2])
+                )
+                for (rules, rule, replacement), counts in self.counts.items()
+            ]
+        stats.sort(key=lambda stat: stat.time, reverse=True)
+        return stats
+
+
+_SNAPSHOT_HEADER = b'inflection rules '
+
+
+class Inflector:
+    """
+    A set of rules for pluralizing and singularizing the words of one
+    language, together with the compiled rules and indexes built from them.
+    Inflectors are independent of each other, so that e.g. each tenant of a
+    service can have rules of its own.  :func:`inflections` keeps one
+    inflector for each locale, and the module level functions use the
+    English one.
+
+    Rules are tried in order and the first one that matches a word wins.  The
+    rules are compiled when they are first used after a change.  Conversions
+    use an immutable snapshot of the compiled rules, so an inflector can be
+    used from many threads at once, also while its rules are being changed:
+    each conversion sees the rules either before or after a change.
+
+    Example::
+
+        >>> inflector = Inflector(
+        ...     plurals=[(r"(?i)$", "s")],
+        ...     singulars=[(r"(?i)s$", "")],
+        ...     uncountables=["fish"],
+        ... )
+        >>> inflector.irregular("person", "people")
+        >>> inflector.pluralize("Person")
+        'People'
+        >>> inflector.singularize_many(["cars", "fish"])
+        ['car', 'fish']
+
+    :param plurals: ``(rule, replacement)`` pairs used by :meth:`pluralize`
+    :param singulars: ``(rule, replacement)`` pairs used by
+        :meth:`singularize`
+    :param uncountables: words that are the same in singular and plural
+    """
+
+    def __init__(
+        self,
+        plurals: typing.Iterable[typing.Tuple[str, str]] = (),
+        singulars: typing.Iterable[typing.Tuple[str, str]] = (),
+        uncountables: typing.Iterable[str] = ()
+    ) -> None:
+        self.plurals: RegexReplaceList = _RuleList(plurals)
+        self.singulars: RegexReplaceList = _RuleList(singulars)
+        self.uncountables: typing.Set[str] = _WordSet(uncountables)
+        self.frozen = False
+        self._snapshot: typing.Optional[_Snapshot] = None
+        self._lock = RLock()
+        self._counters: typing.Optional[_RuleCounters] = None
+
+    def __getstate__(self) -> typing.Dict[str, object]:
+        state = self.__dict__.copy()
+        del state['_lock']
+        # Statistics are kept by each process on its own.
+        state['_counters'] = None
+        return state
+
+    def __setstate__(self, state: typing.Dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._lock = RLock()
+
+    def _rules(self) -> '_Snapshot':
+        """
+        Return the current snapshot of the compiled rules.  This only reads
+        attributes, unless the rules have changed since the snapshot was
+        taken.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.key != _snapshot_key(
+            self.plurals, self.singulars, self.uncountables
+        ):
+            snapshot = self._compile()
+        return snapshot
+
+    def _compile(self) -> '_Snapshot':
+        """
+        Compile the changed rules into a new snapshot and publish it.  Each
+        part of the snapshot is compiled from a copy of the rules, so that
+        changes made meanwhile are not half seen; they make the snapshot stale
+        instead.
+        """
+        with self._lock:
+            plurals, singulars = self.plurals, self.singulars
+            uncountables = self.uncountables
+            key = _snapshot_key(plurals, singulars, uncountables)
+            previous = self._snapshot
+            if previous is not None and previous.key == key:
+                return previous
+            snapshot = self._snapshot = _Snapshot(
+                key,
+                previous.plurals
+                if previous is not None and
+                previous.plurals.is_current(plurals)
+                else _CompiledRules(plurals),
+                previous.singulars
+                if previous is not None and
+                previous.singulars.is_current(singulars)
+                else _CompiledRules(singulars),
+                previous.uncountables
+                if previous is not None and
+                previous.uncountables.is_current(uncountables)
+                else _UncountableIndex(uncountables),
+            )
+            return snapshot
+
+    def freeze(self) -> 'Inflector':
+        """
+        Compile the rules now and refuse any further changes to them, so that
+        no request has to wait for the rules to be compiled.  Return the
+        inflector itself.
+
+        Example::
+
+            >>> inflector = Inflector([(r"(?i)$", "s")]).freeze()
+            >>> inflector.plurals.append((r"(?i)y$", "ies"))
+            Traceback (most recent call last):
+              ...
+            TypeError: frozen rules cannot be modified
+
+        """
+        with self._lock:
+            if not isinstance(self.plurals, _RuleList):
+                self.plurals = _RuleList(self.plurals)
+            if not isinstance(self.singulars, _RuleList):
+                self.singulars = _RuleList(self.singulars)
+            if not isinstance(self.uncountables, _WordSet):
+                self.uncountables = _WordSet(self.uncountables)
+            self.plurals.frozen = True
+            self.singulars.frozen = True
+            self.uncountables.frozen = True
+            self.frozen = True
+            snapshot = self._compile()
+            snapshot.plurals.compile_all()
+            snapshot.singulars.compile_all()
+        return self
+
+    def dumps(self) -> bytes:
+        """
+        Return the rules together with their compiled forms, the rule index
+        and the index of uncountable words, as bytes that :meth:`loads`
+        turns back into an inflector without compiling the rules again.
+        The regular expressions of the rules are not included, they are
+        compiled when first needed.
+
+        Example::
+
+            >>> inflector = Inflector([(r"(?i)$", "s")], [(r"(?i)s$", "")])
+            >>> inflector.irregular("person", "people")
+            >>> Inflector.loads(inflector.dumps()).pluralize("person")
+            'people'
+
+        """
+        import pickle
+
+        payload = pickle.dumps(self._rules(), pickle.HIGHEST_PROTOCOL)
+        return _SNAPSHOT_HEADER + __version__.encode('ascii') + b'\n' + payload
+
+    @classmethod
+    def loads(
+        cls, data: 'typing.Union[bytes, memoryview, mmap.mmap]'
+    ) -> 'Inflector':
+        """
+        Return a new inflector with the rules and compiled forms saved by
+        :meth:`dumps`.  Only load data from a trusted source, as it is
+        unpickled.
+
+        :raises ValueError: if the data was not saved by :meth:`dumps` of the
+            same version of this library
+        """
+        import pickle
+
+        with memoryview(data) as view:
+            end = bytes(view[:64]).find(b'\n') + 1
+            header = bytes(view[:end])
+            if not header.startswith(_SNAPSHOT_HEADER):
+                raise ValueError('not inflection rules')
+            version = header[len(_SNAPSHOT_HEADER):-1].decode('ascii')
+            if version != __version__:
+                raise ValueError(
+                    'the rules were saved by inflection %s, not %s'
+                    % (version, __version__)
+                )
+            snapshot = pickle.loads(view[end:])
+        inflector = cls(
+            snapshot.plurals.source,
+            snapshot.singulars.source,
+            snapshot.uncountables.source,
+        )
+        snapshot.plurals.attach(inflector.plurals)
+        snapshot.singulars.attach(inflector.singulars)
+        snapshot.uncountables.attach(inflector.uncountables)
+        inflector._snapshot = snapshot._replace(key=_snapshot_key(
+            inflector.plurals, inflector.singulars, inflector.uncountables
+        ))
+        return inflector
+
+    def dump(self, path: 'typing.Union[str, os.PathLike[str]]') -> None:
+        """
+        Save the rules and their compiled forms to a file, see :meth:`dumps`.
+        """
+        with open(path, 'wb') as file:
+            file.write(self.dumps())
+
+    @classmethod
+    def load(cls, path: 'typing.Union[str, os.PathLike[str]]') -> 'Inflector':
+        """
+        Return a new inflector with the rules saved to a file by :meth:`dump`.
+        The file is memory-mapped rather than read into memory first.
+
+        To share the rules between worker processes, load them in the parent
+        process before it forks the workers, e.g. in a pre-fork web server.
+        The workers then use the loaded rules from memory shared with the
+        parent, until they change them.
+
+        Only load files from a trusted source, as they are unpickled.
+        """
+        import mmap
+
+        with open(path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return cls.loads(data)
+
+    def add_irregulars(
+        self, pairs: typing.Iterable[typing.Tuple[str, str]]
+    ) -> None:
+        """
+        Add rules to :attr:`plurals` and :attr:`singulars` for irregular
+        words, given as ``(singular, plural)`` pairs.  The rules take
+        precedence over the existing ones, and the rules of a later pair over
+        those of an earlier one, as if :meth:`irregular` was called for each
+        pair in turn.  The rules are added in one step and compiled once.
+
+        Example::
+
+            >>> inflector = Inflector([(r"(?i)$", "s")], [(r"(?i)s$", "")])
+            >>> inflector.add_irregulars([
+            ...     ("person", "people"),
+            ...     ("ox", "oxen"),
+            ... ])
+            >>> inflector.pluralize_many(["Person", "ox", "cow"])
+            ['People', 'oxen', 'cows']
+
+        :param pairs: ``(singular, plural)`` pairs of irregular words
+        """
+        plurals: RegexReplaceList = []
+        singulars: RegexReplaceList = []
+        for singular, plural in reversed(list(pairs)):
+            rules = _irregular_rules(singular, plural)
+            plurals.extend(rules[0])
+            singulars.extend(rules[1])
+        with self._lock:
+            self.plurals[:0] = plurals
+            self.singulars[:0] = singulars
+
+    def add_plural_rules(
+        self, rules: typing.Iterable[typing.Tuple[str, str]]
+    ) -> None:
+        """
+        Add ``(rule, replacement)`` pairs to :attr:`plurals`.  They are tried
+        in the given order, before the existing rules.
+        """
+        rules = list(rules)
+        with self._lock:
+            self.plurals[:0] = rules
+
+    def add_singular_rules(
+        self, rules: typing.Iterable[typing.Tuple[str, str]]
+    ) -> None:
+        """
+        Add ``(rule, replacement)`` pairs to :attr:`singulars`.  They are
+        tried in the given order, before the existing rules.
+        """
+        rules = list(rules)
+        with self._lock:
+            self.singulars[:0] = rules
+
+    def add_uncountables(self, words: typing.Iterable[str]) -> None:
+        """Add words that are the same in singular and plural."""
+        words = list(words)
+        with self._lock:
+            self.uncountables.update(words)
+
+    def irregular(self, singular: str, plural: str) -> None:
+        """
+        Add rules to :attr:`plurals` and :attr:`singulars` for an irregular
+        word.  The rules take precedence over the existing ones.
+
+        :param singular: irregular word in singular form
+        :param plural: irregular word in plural form
+        """
+        self.add_irregulars([(singular, plural)])
+
+    def pluralize(self, word: str) -> str:
+        """Return the plural form of a word, see :func:`pluralize`."""
+        rules = self._rules()
+        if not word or word in rules.uncountables:
+            return word
+        elif self._counters is not None:
+            return self._counted('plurals', rules.plurals, word)
+        else:
+            return rules.plurals.apply(word)
+
+    def pluralize_many(self, words: typing.Iterable[str]) -> typing.List[str]:
+        """Apply :meth:`pluralize` to each word in `words`."""
+        if self._counters is not None:
+            return [self.pluralize(word) for word in words]
+        words = list(words)
+        rules = self._rules()
+        distinct = [
+            word for word in dict.fromkeys(words)
+            if word and word not in rules.uncountables
+        ]
+        results = dict(zip(distinct, rules.plurals.apply_many(distinct)))
+        return [results.get(word, word) for word in words]
+
+    def singularize(self, word: str) -> str:
+        """Return the singular form of a word, see :func:`singularize`."""
+        rules = self._rules()
+        if rules.uncountables.ends(word):
+            return word
+        if self._counters is not None:
+            return self._counted('singulars', rules.singulars, word)
+        return rules.singulars.apply(word)
+
+    def singularize_many(
+        self, words: typing.Iterable[str]
+    ) -> typing.List[str]:
+        """Apply :meth:`singularize` to each word in `words`."""
+        if self._counters is not None:
+            return [self.singularize(word) for word in words]
+        words = list(words)
+        rules = self._rules()
+        distinct = [
+            word for word in dict.fromkeys(words)
+            if not rules.uncountables.ends(word)
+        ]
+        results = dict(zip(distinct, rules.singulars.apply_many(distinct)))
+        return [results.get(word, word) for word in words]
+
+    def tableize(self, word: str) -> str:
+        """Create the name of a table for a model, see :func:`tableize`."""
+        return self.pluralize(underscore(word))
+
+    def tableize_many(self, words: typing.Iterable[str]) -> typing.List[str]:
+        """Apply :meth:`tableize` to each word in `words`."""
+        return self.pluralize_many(underscore_many(words))
+
+    def enable_stats(self) -> None:
+        """
+        Count how often each rule is tried and matches, and the time spent
+        trying it, see :func:`enable_stats`.  Any previous statistics are
+        discarded.
+        """
+        self._counters = _RuleCounters()
+
+    def disable_stats(self) -> None:
+        """Stop counting rule evaluations and discard the statistics."""
+        self._counters = None
+
+    def rule_stats(self) -> typing.List[RuleStats]:
+        """Return the statistics of each rule tried, see :func:`rule_stats`."""
+        counters = self._counters
+        if counters is None:
+            return []
+        return counters.stats()
+
+    def stats_clear(self) -> None:
+        """Reset the statistics of the rules to zero."""
+        if self._counters is not None:
+            self._counters = _RuleCounters()
+
+    def explain(self, word: str, function: str = 'pluralize') -> Explanation:
+        """
+        Return which rules :meth:`pluralize` or :meth:`singularize` tries on
+        a word and which one wins, see :func:`explain`.
+        """
+        rules = self._rules()
+        if function == 'pluralize':
+            uncountable = not word or word in rules.uncountables
+            compiled = rules.plurals
+        elif function == 'singularize':
+            uncountable = rules.uncountables.ends(word)
+            compiled = rules.singulars
+        else:
+            raise ValueError(
+                "function must be 'pluralize' or 'singularize', not %r"
+                % (function,)
+            )
+        if uncountable:
+            return Explanation(word, word, True, [], None)
+        result, tried = compiled.trace(word)
+        pairs = [compiled.pairs[position] for position, _, _ in tried]
+        winner = pairs[-1] if tried and tried[-1][1] else None
+        return Explanation(word, result, False, pairs, winner)
+
+    def _counted(
+        self, rules: str, compiled: _CompiledRules, word: str
+    ) -> str:
+        result, tried = compiled.trace(word)
+        counters = self._counters
+        if counters is not None:
+            counters.record(rules, compiled, tried)
+        return result
+
+
+class _DefaultInflector(Inflector):
+    """
+    The English inflector used by the module level functions.  Its rules are
+    the module globals :data:`PLURALS`, :data:`SINGULARS` and
+    :data:`UNCOUNTABLES`, even when they are reassigned.
+    """
+
+    def __init__(self) -> None:
+        # The rules are already there, only set up the compiled forms.
+        self.frozen = False
+        self._snapshot = None
+        self._lock = RLock()
+        self._counters = None
+
+    @property
+    def plurals(self) -> RegexReplaceList:
+        return PLURALS
+
+    @plurals.setter
+    def plurals(self, rules: RegexReplaceList) -> None:
+        global PLURALS
+        PLURALS = rules
+
+    @property
+    def singulars(self) -> RegexReplaceList:
+        return SINGULARS
+
+    @singulars.setter
+    def singulars(self, rules: RegexReplaceList) -> None:
+        global SINGULARS
+        SINGULARS = rules
+
+    @property
+    def uncountables(self) -> typing.Set[str]:
+        return UNCOUNTABLES
+
+    @uncountables.setter
+    def uncountables(self, words: typing.Set[str]) -> None:
+        global UNCOUNTABLES
+        UNCOUNTABLES = words
+
+
+_default = _DefaultInflector()
+
+_INFLECTORS: typing.Dict[str, Inflector] = {'en': _default}
+
+_INFLECTORS_LOCK = Lock()
+
+
+def inflections(locale: str = 'en') -> Inflector:
+    """
+    Return the :class:`Inflector` of `locale`, like Rails'
+    ``ActiveSupport::Inflector.inflections(:es)``.  An inflector without any
+    rules is created for a locale the first time it is asked for.  The
+    ``'en'`` inflector has the English rules and is the one used by the module
+    level functions.
+
+    Example::
+
+        >>> spanish = inflections('es')
+        >>> spanish.plurals.append((r"(?i)([aeiou])$", r"\\1s"))
+        >>> spanish.plurals.append((r"(?i)$", "es"))
+        >>> spanish.pluralize_many(["libro", "papel"])
+        ['libros', 'papeles']
+        >>> inflections('es') is spanish
+        True
+
+    """
+    try:
+        return _INFLECTORS[locale]
+    except KeyError:
+        with _INFLECTORS_LOCK:
+            return _INFLECTORS.setdefault(locale, Inflector())
+
+
+def add_irregulars(pairs: typing.Iterable[typing.Tuple[str, str]]) -> None:
+    """
+    Add rules for irregular words, given as ``(singular, plural)`` pairs, to
+    :data:`PLURALS` and :data:`SINGULARS`.  See
+    :meth:`Inflector.add_irregulars`.
+    """
+    _default.add_irregulars(pairs)
+
+
+def add_plural_rules(rules: typing.Iterable[typing.Tuple[str, str]]) -> None:
+    """
+    Add ``(rule, replacement)`` pairs to :data:`PLURALS`, to be tried in the
+    given order before the existing rules.
+    """
+    _default.add_plural_rules(rules)
+
+
+def add_singular_rules(rules: typing.Iterable[typing.Tuple[str, str]]) -> None:
+    """
+    Add ``(rule, replacement)`` pairs to :data:`SINGULARS`, to be tried in
+    the given order before the existing rules.
+    """
+    _default.add_singular_rules(rules)
+
+
+def add_uncountables(words: typing.Iterable[str]) -> None:
+    """
+    Add words that are the same in singular and plural to
+    :data:`UNCOUNTABLES`.
+    """
+    _default.add_uncountables(words)
+
+
+def dump_rules(path: 'typing.Union[str, os.PathLike[str]]') -> None:
+    """
+    Save :data:`PLURALS`, :data:`SINGULARS` and :data:`UNCOUNTABLES`
+    together with their compiled forms to a file, see :meth:`Inflector.dump`.
+    """
+    _default.dump(path)
+
+
+def load_rules(path: 'typing.Union[str, os.PathLike[str]]') -> None:
+    """
+    Replace :data:`PLURALS`, :data:`SINGULARS` and :data:`UNCOUNTABLES` with
+    the rules saved to a file by :func:`dump_rules`, without compiling them
+    again, see :meth:`Inflector.load`.  Only load files from a trusted
+    source, as they are unpickled.
+
+    :raises ValueError: if the file was not saved by the same version of this
+        library
+    """
+    loaded = Inflector.load(path)
+    with _default._lock:
+        _default.plurals = loaded.plurals
+        _default.singulars = loaded.singulars
+        _default.uncountables = loaded.uncountables
+        _default._snapshot = loaded._snapshot
 
 
 def _irregular(singular: str, plural: str) -> None:
@@ -99,49 +1524,358 @@ def _irregular(singular: str, plural: str) -> None:
     :param singular: irregular word in singular form
     :param plural: irregular word in plural form
     """
+    _default.irregular(singular, plural)
+
+
+def _irregular_rules(
+    singular: str, plural: str
+) -> typing.Tuple[RegexReplaceList, RegexReplaceList]:
+    """
+    Return the plural and the singular rules for an irregular word, in the
+    order they are tried.
+    """
     def caseinsensitive(string: str) -> str:
-        return ''.join('[' + char + char.upper() + ']' for char in string)
+        return ''.join('[{}{}]'.format(char, char.upper()) for char in string)
 
     if singular[0].upper() == plural[0].upper():
-        PLURALS.insert(0, (
-            r"(?i)({}){}$".format(singular[0], singular[1:]),
-            r'\1' + plural[1:]
-        ))
-        PLURALS.insert(0, (
-            r"(?i)({}){}$".format(plural[0], plural[1:]),
-            r'\1' + plural[1:]
-        ))
-        SINGULARS.insert(0, (
-            r"(?i)({}){}$".format(plural[0], plural[1:]),
-            r'\1' + singular[1:]
-        ))
-    else:
-        PLURALS.insert(0, (
-            r"{}{}$".format(singular[0].upper(),
-                            caseinsensitive(singular[1:])),
-            plural[0].upper() + plural[1:]
-        ))
-        PLURALS.insert(0, (
-            r"{}{}$".format(singular[0].lower(),
-                            caseinsensitive(singular[1:])),
-            plural[0].lower() + plural[1:]
-        ))
-        PLURALS.insert(0, (
-            r"{}{}$".format(plural[0].upper(), caseinsensitive(plural[1:])),
-            plural[0].upper() + plural[1:]
-        ))
-        PLURALS.insert(0, (
-            r"{}{}$".format(plural[0].lower(), caseinsensitive(plural[1:])),
-            plural[0].lower() + plural[1:]
+        return [
+            (r"(?i)({}){}$".format(plural[0], plural[1:]),
+             r"\1{}".format(plural[1:])),
+            (r"(?i)({}){}$".format(singular[0], singular[1:]),
+             r"\1{}".format(plural[1:])),
+        ], [
+            (r"(?i)({}){}$".format(plural[0], plural[1:]),
+             r"\1{}".format(singular[1:])),
+        ]
+    plurals = []
+    singulars = []
+    for first in (str.lower, str.upper):
+        plurals.append((
+            r"{}{}$".format(first(plural[0]), caseinsensitive(plural[1:])),
+            first(plural[0]) + plural[1:]
         ))
-        SINGULARS.insert(0, (
-            r"{}{}$".format(plural[0].upper(), caseinsensitive(plural[1:])),
-            singular[0].upper() + singular[1:]
+        singulars.append((
+            r"{}{}$".format(first(plural[0]), caseinsensitive(plural[1:])),
+            first(singular[0]) + singular[1:]
         ))
-        SINGULARS.insert(0, (
-            r"{}{}$".format(plural[0].lower(), caseinsensitive(plural[1:])),
-            singular[0].lower() + singular[1:]
+    for first in (str.lower, str.upper):
+        plurals.append((
+            r"{}{}$".format(first(singular[0]), caseinsensitive(singular[1:])),
+            first(plural[0]) + plural[1:]
         ))
+    return plurals, singulars
+
+
+class CacheInfo(typing.NamedTuple):
+    """
+    Statistics of the inflection cache, as returned by :func:`cache_info`.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+_Option = typing.TypeVar('_Option')
+
+
+class _LRUCache:
+    """
+    A size-bounded cache of inflection results that discards the least
+    recently used results first.  The cache is cleared when
+    :data:`PLURALS`, :data:`SINGULARS` or :data:`UNCOUNTABLES` change.
+
+    :param maxsize: the maximum number of results to keep
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.maxsize = maxsize
+        self.results: 'collections.OrderedDict[object, object]' = (
+            collections.OrderedDict()
+        )
+        self.lock = Lock()
+        self.rules = _rules_stamp()
+        self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits,
+            self.misses,
+            self.evictions,
+            self.maxsize,
+            len(self.results)
+        )
+
+    def clear(self) -> None:
+        with self.lock:
+            self.results.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def lookup(self, key: object) -> typing.Tuple[bool, object, object]:
+        """
+        Return whether a result is cached under ``key``, the result, and the
+        stamp of the rules to pass to :meth:`store` with the result computed
+        on a miss.
+        """
+        rules = _rules_stamp()
+        with self.lock:
+            if rules != self.rules:
+                self.results.clear()
+                self.rules = rules
+            try:
+                result = self.results[key]
+            except KeyError:
+                self.misses += 1
+                return False, None, rules
+            self.results.move_to_end(key)
+            self.hits += 1
+            return True, result, rules
+
+    def store(self, key: object, result: object, rules: object) -> None:
+        """
+        Cache ``result`` under ``key``, unless the rules have changed since
+        the :meth:`lookup` that returned the stamp ``rules``.  The result may
+        then have been computed with the old rules, after another lookup has
+        already cleared the results of those.
+        """
+        with self.lock:
+            if rules != self.rules:
+                return
+            self.results[key] = result
+            if len(self.results) > self.maxsize:
+                self.results.popitem(last=False)
+                self.evictions += 1
+
+    def call(self, function: typing.Callable[[str], str], string: str) -> str:
+        """Return the cached result of ``function(string)``."""
+        key = (function, string)
+        found, result, rules = self.lookup(key)
+        if found:
+            return typing.cast(str, result)
+        computed = function(string)
+        self.store(key, computed, rules)
+        return computed
+
+    def call_with_option(
+        self,
+        function: typing.Callable[[str, _Option], str],
+        string: str,
+        option: _Option
+    ) -> str:
+        """Return the cached result of ``function(string, option)``."""
+        key = (function, string, option)
+        found, result, rules = self.lookup(key)
+        if found:
+            return typing.cast(str, result)
+        computed = function(string, option)
+        self.store(key, computed, rules)
+        return computed
+
+
+def _rules_stamp() -> object:
+    return (
+        id(PLURALS), _stamp(PLURALS),
+        id(SINGULARS), _stamp(SINGULARS),
+        id(UNCOUNTABLES), _stamp(UNCOUNTABLES),
+    )
+
+
+def _function_stamp(function: typing.Callable[[str], str]) -> object:
+    """
+    Return a stamp of the rules that the results of `function` may depend
+    on: the module level rules and, if `function` is a method of an
+    :class:`Inflector` or a :func:`functools.partial` of one, its rules.
+    """
+    if isinstance(function, functools.partial):
+        function = function.func
+    inflector = getattr(function, '__self__', None)
+    if isinstance(inflector, Inflector):
+        return _rules_stamp(), _snapshot_key(
+            inflector.plurals, inflector.singulars, inflector.uncountables
+        )
+    return _rules_stamp()
+
+
+_cache: typing.Optional[_LRUCache] = None
+
+_Function = typing.TypeVar('_Function', bound=typing.Callable[[str], str])
+
+
+def _cached(function: _Function) -> _Function:
+    """
+    Serve the results of ``function`` from the inflection cache when it has
+    been enabled with :func:`enable_cache`.  ``function`` takes a single
+    string, so that the wrapper adds little to a call while the cache is
+    disabled.  Functions with options check the cache themselves.
+    """
+    def wrapper(string: str) -> str:
+        cache = _cache
+        if cache is None:
+            return function(string)
+        return cache.call(function, string)
+    functools.update_wrapper(wrapper, function)
+    return typing.cast(_Function, wrapper)
+
+
+def _uncached(function: _Function) -> _Function:
+    """Return ``function`` without the wrapper added by :func:`_cached`."""
+    return typing.cast(_Function, getattr(function, '__wrapped__', function))
+
+
+def enable_cache(maxsize: int = 4096) -> None:
+    """
+    Cache the results of the inflection functions, keeping at most `maxsize`
+    of the most recently used results.  Any previously cached results are
+    discarded.
+
+    The cache is cleared whenever :data:`PLURALS`, :data:`SINGULARS` or
+    :data:`UNCOUNTABLES` change, so cached results are never stale.
+    :func:`dasherize`, :func:`ordinal` and :func:`ordinalize` are not cached
+    as computing them is cheaper than a cache lookup, and neither are the
+    batch functions, such as :func:`underscore_many`.
+
+    Example::
+
+        >>> enable_cache(maxsize=100)
+        >>> tableize('Category')
+        'categories'
+        >>> tableize('Category')
+        'categories'
+        >>> cache_info().hits
+        1
+        >>> disable_cache()
+
+    :param maxsize: the maximum number of results to keep
+    """
+    global _cache
+    _cache = _LRUCache(maxsize)
+
+
+def disable_cache() -> None:
+    """Stop caching inflection results and discard the cached ones."""
+    global _cache
+    _cache = None
+
+
+def cache_info() -> CacheInfo:
+    """
+    Return the hits, misses, evictions, maximum size and current size of the
+    inflection cache.  All of them are zero when the cache is disabled.
+    """
+    cache = _cache
+    if cache is None:
+        return CacheInfo(0, 0, 0, 0, 0)
+    return cache.info()
+
+
+def cache_clear() -> None:
+    """Discard the cached inflection results and reset the statistics."""
+    cache = _cache
+    if cache is not None:
+        cache.clear()
+
+
+def enable_stats() -> None:
+    """
+    Count how often each rule in :data:`PLURALS` and :data:`SINGULARS` is
+    tried by :func:`pluralize` and :func:`singularize`, how often it matches
+    and the time spent trying it.  Any previous statistics are discarded.
+
+    Use the statistics to find the rules that are tried the most or that
+    never match, e.g. to reorder or remove custom rules.  Counting slows the
+    conversions down, so it is off by default.  Results served from the cache
+    of :func:`enable_cache` are not counted.
+
+    Example::
+
+        >>> enable_stats()
+        >>> pluralize_many(["bus", "status"])
+        ['buses', 'statuses']
+        >>> stats = rule_stats()
+        >>> sorted((stat.rule, stat.evaluations, stat.matches)
+        ...        for stat in stats)[0]
+        ('(?i)(alias|status)$', 1, 1)
+        >>> disable_stats()
+
+    """
+    _default.enable_stats()
+
+
+def disable_stats() -> None:
+    """Stop counting rule evaluations and discard the statistics."""
+    _default.disable_stats()
+
+
+def rule_stats() -> typing.List[RuleStats]:
+    """
+    Return the statistics of each rule tried since :func:`enable_stats`,
+    the rules that took the most time first.  The list is empty when
+    counting is disabled.
+    """
+    return _default.rule_stats()
+
+
+def stats_clear() -> None:
+    """Reset the statistics of the rules to zero."""
+    _default.stats_clear()
+
+
+def explain(word: str, function: str = 'pluralize') -> Explanation:
+    """
+    Return the rules :func:`pluralize` or :func:`singularize` tries on a word,
+    in order, and the rule that wins.  Rules that cannot match the word, e.g.
+    because it does not end in the suffix a rule requires, are skipped and
+    not listed.
+
+    Example::
+
+        >>> explanation = explain("octopus")
+        >>> explanation.result
+        'octopi'
+        >>> explanation.winner
+        ('(?i)(octop|vir)us$', '\\\\1i')
+        >>> explain("octopi", "singularize").result
+        'octopus'
+
+    :param word: the word to inflect
+    :param function: ``'pluralize'`` or ``'singularize'``
+    """
+    return _default.explain(word, function)
+
+
+def _map_distinct(
+    function: typing.Callable[[str], str],
+    strings: typing.Iterable[str]
+) -> typing.List[str]:
+    """
+    Apply ``function`` to each string in ``strings``, calling it only once for
+    each distinct string.
+    """
+    strings = list(strings)
+    results = {string: function(string) for string in dict.fromkeys(strings)}
+    return [results[string] for string in strings]
+
+
+def _fill_in(
+    results: typing.List[typing.Optional[str]],
+    strings: typing.List[str],
+    function: typing.Callable[[str], str]
+) -> typing.List[str]:
+    """
+    Complete the ``results`` of a function in :mod:`inflection._speedups` for
+    ``strings`` by applying ``function`` to the strings that it left to
+    Python by returning ``None``.
+    """
+    if None not in results:
+        return typing.cast(typing.List[str], results)
+    return [
+        function(string) if result is None else result
+        for string, result in zip(strings, results)
+    ]
 
 
 def camelize(string: str, uppercase_first_letter: bool = True) -> str:
@@ -165,10 +1899,96 @@ def camelize(string: str, uppercase_first_letter: bool = True) -> str:
         strings to UpperCamelCase. If set to `False` :func:`camelize` produces
         lowerCamelCase. Defaults to `True`.
     """
+    cache = _cache
     if uppercase_first_letter:
-        return re.sub(r"(?:^|_)(.)", lambda m: m.group(1).upper(), string)
+        if cache is not None:
+            return cache.call(_upper_camelize, string)
+        return _upper_camelize(string)
     else:
-        return string[0].lower() + camelize(string)[1:]
+        if cache is not None:
+            return cache.call(_lower_camelize, string)
+        return _lower_camelize(string)
+
+
+def _upper_camelize(string: str) -> str:
+    if _SPEEDUPS:
+        result = _speedups.camelize(string)
+        if result is not None:
+            return result
+    if '_' not in string:
+        return string[:1].upper() + string[1:]
+    # Splitting at underscores gives the same result as the regular
+    # expression unless an underscore is followed by another underscore, a
+    # newline or nothing, or starts the string.
+    if (
+        string[0] == '_' or string[-1] == '_' or
+        '__' in string or '_\n' in string
+    ):
+        return _CAMELIZE_WORD_START.sub(_upper_group, string)
+    letters = string.replace('_', '')
+    if _is_ascii(letters) and letters.isalpha() and letters.islower():
+        # Typical snake_case: title() uppercases exactly the word starts.
+        return string.title().replace('_', '')
+    return ''.join([
+        word[:1].upper() + word[1:] for word in string.split('_')
+    ])
+
+
+def _lower_camelize(string: str) -> str:
+    if _SPEEDUPS:
+        result = _speedups.camelize(string, False)
+        if result is not None:
+            return result
+    return string[0].lower() + _upper_camelize(string)[1:]
+
+
+_CAMELIZE_WORD_START = _lazy_compile(
+    '_CAMELIZE_WORD_START', r"(?:^|_)(.)"
+)
+
+
+def _upper_group(match: 'typing.Match[str]') -> str:
+    return match.group(1).upper()
+
+
+def camelize_many(
+    strings: typing.Iterable[str],
+    uppercase_first_letter: bool = True
+) -> typing.List[str]:
+    """
+    Apply :func:`camelize` to each string in `strings`.
+
+    Example::
+
+        >>> camelize_many(["device_type", "device_id"], False)
+        ['deviceType', 'deviceId']
+
+    """
+    function = _upper_camelize if uppercase_first_letter else _lower_camelize
+    strings = list(strings)
+    if _SPEEDUPS:
+        results = list(map(
+            _speedups.camelize, strings,
+            itertools.repeat(uppercase_first_letter)
+        ))
+        return _fill_in(results, strings, function)
+    return [function(string) for string in strings]
+
+
+def camelize_keys(obj: _T, uppercase_first_letter: bool = True) -> _T:
+    """
+    Apply :func:`camelize` to the keys of the dictionaries in `obj`, see
+    :func:`transform_keys`.
+
+    Example::
+
+        >>> camelize_keys({"device_type": {"device_id": 1}}, False)
+        {'deviceType': {'deviceId': 1}}
+
+    """
+    return transform_keys(
+        obj, _upper_camelize if uppercase_first_letter else _lower_camelize
+    )
 
 
 def dasherize(word: str) -> str:
@@ -183,6 +2003,12 @@ def dasherize(word: str) -> str:
     return word.replace('_', '-')
 
 
+def dasherize_many(words: typing.Iterable[str]) -> typing.List[str]:
+    """Apply :func:`dasherize` to each word in `words`."""
+    return [word.replace('_', '-') for word in words]
+
+
+@_cached
 def humanize(word: str) -> str:
     """
     Capitalize the first word and turn underscores into spaces and strip a
@@ -197,13 +2023,30 @@ def humanize(word: str) -> str:
         'Author'
 
     """
-    word = re.sub(r"_id$", "", word)
+    if word.endswith('_id'):
+        word = word[:-3]
+    elif word.endswith('_id\n'):
+        word = word[:-4] + '\n'
     word = word.replace('_', ' ')
-    word = re.sub(r"(?i)([a-z\d]*)", lambda m: m.group(1).lower(), word)
-    word = re.sub(r"^\w", lambda m: m.group(0).upper(), word)
+    # Only letters that ASCII letters match case-insensitively are lowered.
+    word = word.lower() if _is_ascii(word) else word.translate(_ASCII_LOWER)
+    if _is_word_char(word[:1]):
+        word = word[:1].upper() + word[1:]
     return word
 
 
+_ASCII_LOWER = {
+    ord(char): char.lower()
+    for char in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ\u0130\u212a'
+}
+
+
+def humanize_many(words: typing.Iterable[str]) -> typing.List[str]:
+    """Apply :func:`humanize` to each word in `words`."""
+    function = _uncached(humanize)
+    return [function(word) for word in words]
+
+
 def ordinal(number: int) -> str:
     """
     Return the suffix that should be added to a number to denote the position
@@ -225,6 +2068,10 @@ def ordinal(number: int) -> str:
         'st'
 
     """
+    if _SPEEDUPS:
+        suffix = _speedups.ordinal(number)
+        if suffix is not None:
+            return suffix
     number = abs(int(number))
     if number % 100 in (11, 12, 13):
         return "th"
@@ -236,6 +2083,11 @@ def ordinal(number: int) -> str:
         }.get(number % 10, "th")
 
 
+def ordinal_many(numbers: typing.Iterable[int]) -> typing.List[str]:
+    """Apply :func:`ordinal` to each number in `numbers`."""
+    return [ordinal(number) for number in numbers]
+
+
 def ordinalize(number: int) -> str:
     """
     Turn a number into an ordinal string used to denote the position in an
@@ -260,6 +2112,148 @@ def ordinalize(number: int) -> str:
     return "{}{}".format(number, ordinal(number))
 
 
+def ordinalize_many(numbers: typing.Iterable[int]) -> typing.List[str]:
+    """Apply :func:`ordinalize` to each number in `numbers`."""
+    return [ordinalize(number) for number in numbers]
+
+
+def parallel_map(
+    function: typing.Callable[[str], str],
+    strings: typing.Iterable[str],
+    workers: typing.Optional[int] = None,
+    chunksize: typing.Optional[int] = None
+) -> typing.List[str]:
+    """
+    Apply `function` to each string in `strings` in a pool of worker
+    processes and return the results in input order.  This pays off for
+    millions of strings, where a single core is the limit.
+
+    The strings are split into chunks of `chunksize` strings, by default
+    enough chunks to give each worker about four, but no more than 10000
+    strings per chunk to bound the memory use of each task.  The current
+    :data:`PLURALS`, :data:`SINGULARS` and :data:`UNCOUNTABLES`, including
+    any irregular words and custom rules, are sent to each worker once along
+    with `function`, and the tasks only carry the chunks.  Inflection
+    functions with a batch counterpart, e.g. :func:`pluralize_many`, use it to
+    convert the chunks.
+
+    Example::
+
+        >>> parallel_map(tableize, ["Person", "DeviceType"], workers=2)
+        ['people', 'device_types']
+
+    :param function: a picklable function such as :func:`parameterize`, a
+        :func:`functools.partial` of one, or a method of an :class:`Inflector`
+    :param workers: the number of worker processes, defaults to the number of
+        CPUs
+    """
+    strings = list(strings)
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = min(-(-len(strings) // (4 * workers)) or 1, 10000)
+    chunks = [
+        strings[start:start + chunksize]
+        for start in range(0, len(strings), chunksize)
+    ]
+    if workers == 1 or len(chunks) < 2:
+        return _map_chunk(function, strings)
+
+    # Unlike multiprocessing pools, ProcessPoolExecutor only takes an
+    # initializer from Python 3.7 on.
+    import multiprocessing
+
+    results: typing.List[str] = []
+    with multiprocessing.Pool(
+        workers,
+        _start_worker,
+        (function, list(PLURALS), list(SINGULARS), set(UNCOUNTABLES)),
+    ) as pool:
+        for chunk in pool.map(_map_worker_chunk, chunks):
+            results.extend(chunk)
+    return results
+
+
+def _map_chunk(
+    function: typing.Callable[[str], str],
+    strings: typing.List[str]
+) -> typing.List[str]:
+    batch = _BATCH_FUNCTIONS.get(function)
+    inflector = getattr(function, '__self__', None)
+    if batch is None and isinstance(inflector, Inflector):
+        batch = getattr(inflector, function.__name__ + '_many', None)
+    if batch is None:
+        return _map_distinct(function, strings)
+    return batch(strings)
+
+
+# The function that a worker process of :func:`parallel_map` applies.
+_worker_function: typing.Optional[typing.Callable[[str], str]] = None
+
+
+def _start_worker(
+    function: typing.Callable[[str], str],
+    plurals: RegexReplaceList,
+    singulars: RegexReplaceList,
+    uncountables: typing.Set[str]
+) -> None:
+    """
+    Set the function of a worker process and replace its rules with those of
+    the parent.
+    """
+    global _worker_function, PLURALS, SINGULARS, UNCOUNTABLES
+    _worker_function = function
+    PLURALS = _RuleList(plurals)
+    SINGULARS = _RuleList(singulars)
+    UNCOUNTABLES = _WordSet(uncountables)
+
+
+def _map_worker_chunk(strings: typing.List[str]) -> typing.List[str]:
+    function = typing.cast(typing.Callable[[str], str], _worker_function)
+    return _map_chunk(function, strings)
+
+
+def map_array(
+    function: typing.Callable[[str], str],
+    values: typing.Iterable[str]
+) -> typing.Union['numpy.typing.NDArray[numpy.object_]', typing.List[str]]:
+    """
+    Apply `function` to each string in `values`, such as a NumPy array or a
+    pandas column, and return the results as a NumPy array of the same shape
+    with the ``object`` dtype.  Without NumPy installed, the results are
+    returned as a list.
+
+    Columns tend to repeat a few distinct values over many rows, so each
+    distinct value is converted only once, with the batch counterpart of
+    `function` if it has one, e.g. :func:`tableize_many`, and the results are
+    scattered back to the rows.
+
+    Example::
+
+        >>> list(map_array(tableize, ["RawScaledScorer", "RawScaledScorer"]))
+        ['raw_scaled_scorers', 'raw_scaled_scorers']
+
+    With pandas, ``df["table"] = map_array(tableize, df["model"])`` converts
+    a column much faster than ``df["model"].map(tableize)``.
+
+    :param function: a function such as :func:`underscore`, a
+        :func:`functools.partial` of one, or a method of an :class:`Inflector`
+    """
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover
+        return _map_chunk(function, list(values))
+    if not hasattr(values, '__array__'):
+        # Such as generators and sets, which NumPy does not iterate over.
+        values = list(values)
+    array = numpy.asarray(values, dtype=object)
+    strings = array.ravel().tolist()
+    distinct = list(dict.fromkeys(strings))
+    converted = dict(zip(distinct, _map_chunk(function, distinct)))
+    results = numpy.empty(len(strings), dtype=object)
+    results[:] = [converted[string] for string in strings]
+    return results.reshape(array.shape)
+
+
 def parameterize(string: str, separator: str = '-') -> str:
     """
     Replace special characters in a string so that it may be used as part of a
@@ -271,19 +2265,88 @@ def parameterize(string: str, separator: str = '-') -> str:
         'donald-e-knuth'
 
     """
-    string = transliterate(string)
-    # Turn unwanted chars into the separator
-    string = re.sub(r"(?i)[^a-z0-9\-_]+", separator, string)
-    if separator:
-        re_sep = re.escape(separator)
+    cache = _cache
+    if cache is not None:
+        return cache.call_with_option(_parameterize, string, separator)
+    return _parameterize(string, separator)
+
+
+def _parameterize(string: str, separator: str) -> str:
+    if _SPEEDUPS:
+        result = _speedups.parameterize(string, separator)
+        if result is not None:
+            return result
+    return _parameterizer(separator)(transliterate(string))
+
+
+_UNWANTED_CHARACTERS = _lazy_compile(
+    '_UNWANTED_CHARACTERS', r"(?i)[^a-z0-9\-_]+"
+)
+
+_ALLOWED_CHARACTERS = (
+    'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_'
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _parameterizer(separator: str) -> typing.Callable[[str], str]:
+    """
+    Return a function that does the work of :func:`parameterize` with
+    `separator` for an already transliterated string.
+    """
+    if not separator:
+        return lambda string: _UNWANTED_CHARACTERS.sub('', string).lower()
+
+    if len(separator) == 1 and separator.lower() == separator.upper():
+        # Turning unwanted characters into the separator, squeezing repeated
+        # separators and removing them from both ends leaves the runs of
+        # allowed characters other than the separator, joined by it.
+        segments = re.compile('[%s]+' % ''.join(
+            re.escape(char) for char in _ALLOWED_CHARACTERS
+            if char != separator
+        ))
+        return lambda string: separator.join(
+            segments.findall(string)
+        ).lower()
+
+    re_sep = re.escape(separator)
+    repeated = re.compile(r'%s{2,}' % re_sep)
+    leading_or_trailing = re.compile(
+        r"(?i)^{sep}|{sep}$".format(sep=re_sep)
+    )
+
+    def parameterizer(string: str) -> str:
+        # Turn unwanted chars into the separator
+        string = _UNWANTED_CHARACTERS.sub(separator, string)
         # No more than one of the separator in a row.
-        string = re.sub(r'%s{2,}' % re_sep, separator, string)
+        string = repeated.sub(separator, string)
         # Remove leading/trailing separator.
-        string = re.sub(r"(?i)^{sep}|{sep}$".format(sep=re_sep), '', string)
-
-    return string.lower()
+        string = leading_or_trailing.sub('', string)
+        return string.lower()
+
+    return parameterizer
+
+
+def parameterize_many(
+    strings: typing.Iterable[str],
+    separator: str = '-'
+) -> typing.List[str]:
+    """Apply :func:`parameterize` to each string in `strings`."""
+    parameterizer = _parameterizer(separator)
+    function = _uncached(transliterate)
+    strings = list(strings)
+    if _SPEEDUPS:
+        results = list(map(
+            _speedups.parameterize, strings, itertools.repeat(separator)
+        ))
+        return _fill_in(
+            results, strings,
+            lambda string: parameterizer(function(string))
+        )
+    return [parameterizer(function(string)) for string in strings]
 
 
+@_cached
 def pluralize(word: str) -> str:
     """
     Return the plural form of a word.
@@ -300,15 +2363,26 @@ def pluralize(word: str) -> str:
         'CamelOctopi'
 
     """
-    if not word or word.lower() in UNCOUNTABLES:
-        return word
-    else:
-        for rule, replacement in PLURALS:
-            if re.search(rule, word):
-                return re.sub(rule, replacement, word)
-        return word
+    return _default.pluralize(word)
+
+
+def pluralize_many(words: typing.Iterable[str]) -> typing.List[str]:
+    """
+    Apply :func:`pluralize` to each word in `words`.
 
+    Each distinct word is pluralized once, and words that can only match the
+    same rules are matched against those rules together.
 
+    Example::
+
+        >>> pluralize_many(["post", "octopus", "sheep", "post"])
+        ['posts', 'octopi', 'sheep', 'posts']
+
+    """
+    return _default.pluralize_many(words)
+
+
+@_cached
 def singularize(word: str) -> str:
     """
     Return the singular form of a word, the reverse of :func:`pluralize`.
@@ -327,16 +2401,164 @@ def singularize(word: str) -> str:
         'CamelOctopus'
 
     """
-    for inflection in UNCOUNTABLES:
-        if re.search(r'(?i)\b(%s)\Z' % inflection, word):
-            return word
+    return _default.singularize(word)
 
-    for rule, replacement in SINGULARS:
-        if re.search(rule, word):
-            return re.sub(rule, replacement, word)
-    return word
 
+def singularize_many(words: typing.Iterable[str]) -> typing.List[str]:
+    """
+    Apply :func:`singularize` to each word in `words`.
+
+    Each distinct word is singularized once, and words that can only match
+    the same rules are matched against those rules together.
+    """
+    return _default.singularize_many(words)
+
+
+def stream(
+    lines: typing.Iterable[str],
+    *functions: typing.Callable[[str], str],
+    memo_size: int = 1024
+) -> typing.Iterator[str]:
+    """
+    Apply each of `functions` in turn to every line in `lines` and yield the
+    results one at a time, keeping the line endings.  `lines` can be any
+    iterable of strings, such as a text file, so large inputs can be
+    converted in constant memory.
+
+    The results of the most recent distinct lines are remembered, up to
+    `memo_size` of them, so repeated lines are only converted once.
+
+    Example::
+
+        >>> names = ["DeviceType\\n", "Person\\n", "DeviceType"]
+        >>> list(stream(names, underscore, pluralize, dasherize))
+        ['device-types\\n', 'people\\n', 'device-types']
+
+    """
+    memo: typing.Dict[str, str] = {}
+    for line in lines:
+        text = line.rstrip('\r\n')
+        try:
+            result = memo[text]
+        except KeyError:
+            result = text
+            for function in functions:
+                result = function(result)
+            if len(memo) >= memo_size:
+                memo.clear()
+            memo[text] = result
+        yield result + line[len(text):]
+
+
+class InternInfo(typing.NamedTuple):
+    """
+    Statistics of an :class:`Interner`, as returned by
+    :meth:`Interner.info`: the number of strings converted, how many of them
+    were computed rather than served from the remembered results, and the
+    number of results currently remembered.
+    """
+
+    strings: int
+    computed: int
+    currsize: int
+
+    @property
+    def ratio(self) -> float:
+        """The number of strings converted per string computed."""
+        return self.strings / self.computed if self.computed else 0.0
 
+
+class Interner:
+    """
+    Convert strings in bulk with `function`, computing each distinct string
+    once and returning the results as interned strings, so that equal
+    results share one string object.  This suits log and event streams where
+    a small vocabulary repeats heavily: the conversions are done once, and
+    the converted labels kept take the memory of a single reference each.
+
+    The distinct strings and their results are remembered across calls, up
+    to `maxsize` of them, and forgotten all at once when there are more.
+    They are also forgotten when :data:`PLURALS`, :data:`SINGULARS` or
+    :data:`UNCOUNTABLES` change, or the rules of the :class:`Inflector` that
+    `function` is a method of.
+
+    Example::
+
+        >>> labels = Interner(humanize)
+        >>> labels(["employee_salary", "author_id", "employee_salary"])
+        ['Employee salary', 'Author', 'Employee salary']
+        >>> labels(["author_id"])
+        ['Author']
+        >>> labels.info()
+        InternInfo(strings=4, computed=2, currsize=2)
+        >>> labels.info().ratio
+        2.0
+
+    :param function: a function such as :func:`humanize`, :func:`titleize`
+        or :func:`camelize`, or a :func:`functools.partial` of one
+    :param maxsize: the maximum number of distinct strings to remember
+    """
+
+    def __init__(
+        self,
+        function: typing.Callable[[str], str],
+        maxsize: int = 65536
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.function = function
+        self.maxsize = maxsize
+        self.lock = Lock()
+        self.results: typing.Dict[str, str] = {}
+        self.rules = _function_stamp(function)
+        self.strings = 0
+        self.computed = 0
+
+    def __call__(self, strings: typing.Iterable[str]) -> typing.List[str]:
+        """Return `function` applied to each string in `strings`."""
+        strings = list(strings)
+        rules = _function_stamp(self.function)
+        found: typing.Dict[str, str] = {}
+        new = []
+        with self.lock:
+            if rules != self.rules:
+                self.results.clear()
+                self.rules = rules
+            known = self.results
+            for string in dict.fromkeys(strings):
+                result = known.get(string)
+                if result is None:
+                    new.append(sys.intern(string))
+                else:
+                    found[string] = result
+        # Convert outside the lock, so that other threads are not held up.
+        for string, result in zip(new, _map_chunk(self.function, new)):
+            found[string] = sys.intern(result)
+        with self.lock:
+            # Results computed with rules that have changed in the meantime
+            # must not be remembered for the new rules.
+            if rules == self.rules:
+                if len(self.results) + len(new) > self.maxsize:
+                    self.results.clear()
+                for string in itertools.islice(new, self.maxsize):
+                    self.results[string] = found[string]
+            self.strings += len(strings)
+            self.computed += len(new)
+        return [found[string] for string in strings]
+
+    def info(self) -> InternInfo:
+        """Return the statistics of the conversions so far."""
+        with self.lock:
+            return InternInfo(self.strings, self.computed, len(self.results))
+
+    def clear(self) -> None:
+        """Forget the remembered results and reset the statistics."""
+        with self.lock:
+            self.results.clear()
+            self.strings = self.computed = 0
+
+
+@_cached
 def tableize(word: str) -> str:
     """
     Create the name of a table like Rails does for models to table names. This
@@ -354,6 +2576,12 @@ def tableize(word: str) -> str:
     return pluralize(underscore(word))
 
 
+def tableize_many(words: typing.Iterable[str]) -> typing.List[str]:
+    """Apply :func:`tableize` to each word in `words`."""
+    return pluralize_many(underscore_many(words))
+
+
+@_cached
 def titleize(word: str) -> str:
     """
     Capitalize all the words and replace some characters in the string to
@@ -372,13 +2600,133 @@ def titleize(word: str) -> str:
       'Raiders Of The Lost Ark'
 
     """
-    return re.sub(
-        r"\b('?\w)",
-        lambda match: match.group(1).capitalize(),
-        humanize(underscore(word)).title()
-    )
+    words = _words(word)
+    # Strip a trailing "id" like humanize() does, which also allows a newline
+    # after it.
+    if len(words) > 1 and words[-1].lower() in ('id', 'id\n'):
+        newline = words.pop()[2:]
+        words[-1] += newline
+    title = ' '.join(words).lower().title()
+    if "'" in title:
+        # title() capitalizes letters after an apostrophe, as in "Don'T".
+        title = _WORD_START.sub(_capitalize, title)
+    return title
+
+
+_WORD_START = _lazy_compile('_WORD_START', r"\b('?\w)")
 
 
+def _capitalize(match: 'typing.Match[str]') -> str:
+    return match.group(1).capitalize()
+
+
+def titleize_many(words: typing.Iterable[str]) -> typing.List[str]:
+    """Apply :func:`titleize` to each word in `words`."""
+    function = _uncached(titleize)
+    return [function(word) for word in words]
+
+
+def transform_keys(
+    obj: _T,
+    function: typing.Callable[[str], str],
+    memo_size: int = 4096
+) -> _T:
+    """
+    Return a copy of `obj` with `function` applied to the string keys of the
+    dictionaries in it, at any depth of nested dictionaries and lists.  Other
+    values are not copied.  Nested structures are walked without recursion,
+    so deeply nested payloads do not hit the recursion limit.
+
+    The converted keys are remembered across calls, up to `memo_size` of them
+    for each function, so each distinct key is converted only once.
+
+    Example::
+
+        >>> transform_keys({"device_type": [{"device_id": 1}]}, dasherize)
+        {'device-type': [{'device-id': 1}]}
+
+    :param function: a function to convert a key, e.g. :func:`underscore`
+    """
+    memo = _key_memo(function)
+    result = _empty_copy(obj)
+    pending = [(obj, result)]
+    while pending:
+        source, target = pending.pop()
+        if isinstance(source, dict) and isinstance(target, dict):
+            for key, value in source.items():
+                if isinstance(key, str):
+                    try:
+                        key = memo[key]
+                    except KeyError:
+                        converted = function(key)
+                        if len(memo) >= memo_size:
+                            memo.clear()
+                        memo[key] = converted
+                        key = converted
+                copy = _empty_copy(value)
+                target[key] = copy
+                if copy is not value:
+                    pending.append((value, copy))
+        elif isinstance(source, list) and isinstance(target, list):
+            for value in source:
+                copy = _empty_copy(value)
+                target.append(copy)
+                if copy is not value:
+                    pending.append((value, copy))
+    return typing.cast(_T, result)
+
+
+def _empty_copy(value: object) -> object:
+    if isinstance(value, dict):
+        return {}
+    if isinstance(value, list):
+        return []
+    return value
+
+
+_KeyMemo = typing.Tuple[object, typing.Dict[str, str]]
+
+# The remembered key conversions of each function, or of each method by the
+# object it is bound to.  Made on first use, so that importing this module
+# does not import weakref.
+_KEY_MEMOS: typing.Optional[
+    'weakref.WeakKeyDictionary[object, typing.Dict[object, _KeyMemo]]'
+] = None
+
+
+def _key_memo(function: typing.Callable[[str], str]) -> typing.Dict[str, str]:
+    """
+    Return the remembered key conversions of `function`.  They are forgotten
+    when the rules change, as the conversion may depend on them.
+
+    A bound method, such as ``inflector.pluralize``, is a new object on every
+    attribute access, so methods are remembered by the object they are bound
+    to and their function, for as long as that object lives.
+    """
+    stamp = _function_stamp(function)
+    owner: object = function
+    key: object = None
+    method = getattr(function, '__func__', None)
+    if method is not None:
+        owner, key = getattr(function, '__self__'), method
+    global _KEY_MEMOS
+    if _KEY_MEMOS is None:
+        import weakref
+
+        _KEY_MEMOS = weakref.WeakKeyDictionary()
+    try:
+        memos = _KEY_MEMOS.setdefault(owner, {})
+    except TypeError:
+        # The function cannot be weakly referenced, do not remember.
+        return {}
+    memo_stamp, memo = memos.get(key, (None, None))
+    if memo is None or memo_stamp != stamp:
+        memo = {}
+        memos[key] = (stamp, memo)
+    return memo
+
+
+@_cached
 def transliterate(string: str) -> str:
     """
     Replace non-ASCII characters with an ASCII approximation. If no
@@ -390,13 +2738,46 @@ def transliterate(string: str) -> str:
         >>> transliterate('älämölö')
         'alamolo'
         >>> transliterate('Ærøskøbing')
-        'rskbing'
+        'AEroskobing'
 
     """
+    if _is_ascii(string):
+        return string
     normalized = unicodedata.normalize('NFKD', string)
+    if _SPEEDUPS:
+        result = _speedups.to_ascii(normalized)
+        if result is not None:
+            return result
+    if _APPROXIMATED.search(normalized):
+        normalized = _APPROXIMATED.sub(_approximate, normalized)
     return normalized.encode('ascii', 'ignore').decode('ascii')
 
 
+# Keep approximation() in _speedups.c in sync with this.
+#: ASCII approximations of letters that have no decomposition to ASCII.
+_APPROXIMATIONS = {
+    'Æ': 'AE', 'æ': 'ae', 'Ð': 'D', 'ð': 'd', 'Ø': 'O', 'ø': 'o',
+    'Þ': 'Th', 'þ': 'th', 'ß': 'ss', 'ẞ': 'SS', 'Đ': 'D', 'đ': 'd',
+    'Ħ': 'H', 'ħ': 'h', 'ı': 'i', 'ĸ': 'k', 'Ł': 'L', 'ł': 'l',
+    'Ŋ': 'NG', 'ŋ': 'ng', 'Œ': 'OE', 'œ': 'oe', 'Ŧ': 'T', 'ŧ': 't',
+}
+
+_APPROXIMATED = _lazy_compile(
+    '_APPROXIMATED', '[%s]' % ''.join(_APPROXIMATIONS)
+)
+
+
+def _approximate(match: 'typing.Match[str]') -> str:
+    return _APPROXIMATIONS[match.group()]
+
+
+def transliterate_many(strings: typing.Iterable[str]) -> typing.List[str]:
+    """Apply :func:`transliterate` to each string in `strings`."""
+    function = _uncached(transliterate)
+    return [function(string) for string in strings]
+
+
+@_cached
 def underscore(word: str) -> str:
     """
     Make an underscored, lowercase form from the expression in the string.
@@ -413,17 +2794,85 @@ def underscore(word: str) -> str:
         'IoError'
 
     """
-    word = re.sub(r"([A-Z]+)([A-Z][a-z])", r'\1_\2', word)
-    word = re.sub(r"([a-z\d])([A-Z])", r'\1_\2', word)
-    word = word.replace("-", "_")
-    return word.lower()
+    if _SPEEDUPS:
+        result = _speedups.underscore(word)
+        if result is not None:
+            return result
+    return '_'.join(_words(word)).lower()
+
+
+_WORD_BOUNDARY = _lazy_compile(
+    '_WORD_BOUNDARY',
+    r"[-_]|(?<=[A-Z])(?=[A-Z][a-z])|(?<=[a-z\d])(?=[A-Z])"
+)
+
+
+def _words(identifier: str) -> typing.List[str]:
+    """
+    Split an identifier into words in one pass: at dashes and underscores, at
+    a lowercase letter or digit followed by an uppercase letter, and before
+    the last letter of an uppercase run followed by a lowercase letter, e.g.
+    ``"HTMLParser_v2"`` into ``["HTML", "Parser", "v2"]``.
+    """
+    return _WORD_BOUNDARY.split(identifier)
+
+
+def underscore_many(words: typing.Iterable[str]) -> typing.List[str]:
+    """
+    Apply :func:`underscore` to each word in `words`.
 
+    Words that are already lowercase and contain no dashes are passed
+    through as they are.
+    """
+    function = _uncached(underscore)
+    words = list(words)
+    if _SPEEDUPS:
+        results = list(map(_speedups.underscore, words))
+        return _fill_in(results, words, function)
+    return [
+        word if word.islower() and '-' not in word else function(word)
+        for word in words
+    ]
+
+
+def underscore_keys(obj: _T) -> _T:
+    """
+    Apply :func:`underscore` to the keys of the dictionaries in `obj`, see
+    :func:`transform_keys`.
+
+    Example::
+
+        >>> underscore_keys([{"deviceType": "PC", "deviceId": 1}])
+        [{'device_type': 'PC', 'device_id': 1}]
 
-_irregular('person', 'people')
-_irregular('man', 'men')
-_irregular('human', 'humans')
-_irregular('child', 'children')
-_irregular('sex', 'sexes')
-_irregular('move', 'moves')
-_irregular('cow', 'kine')
-_irregular('zombie', 'zombies')
+    """
+    return transform_keys(obj, underscore)
+
+
+_BATCH_FUNCTIONS: typing.Dict[
+    typing.Callable[[str], str],
+    typing.Callable[[typing.Iterable[str]], typing.List[str]]
+] = {
+    camelize: camelize_many,
+    dasherize: dasherize_many,
+    humanize: humanize_many,
+    parameterize: parameterize_many,
+    pluralize: pluralize_many,
+    singularize: singularize_many,
+    tableize: tableize_many,
+    titleize: titleize_many,
+    transliterate: transliterate_many,
+    underscore: underscore_many,
+}
+
+
+add_irregulars([
+    ('person', 'people'),
+    ('man', 'men'),
+    ('human', 'humans'),
+    ('child', 'children'),
+    ('sex', 'sexes'),
+    ('move', 'moves'),
+    ('cow', 'kine'),
+    ('zombie', 'zombies'),
+])
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+    inflection.__main__
+    ~~~~~~~~~~~~~~~~~~~
+
+    Command line interface that applies inflection functions to every line of
+    its input, e.g. ``inflection tableize < names.txt``.
+
+    :copyright: (c) 2012-2020 by Janne Vanhala
+
+    :license: MIT, see LICENSE for more details.
+"""
+import argparse
+import collections
+import io
+import sys
+import typing
+
+import inflection
+
+FUNCTIONS = (
+    'camelize',
+    'dasherize',
+    'humanize',
+    'parameterize',
+    'pluralize',
+    'singularize',
+    'tableize',
+    'titleize',
+    'transliterate',
+    'underscore',
+)
+
+CHUNK_SIZE = 1 << 20
+
+
+def convert(
+    block: str,
+    functions: typing.Sequence[str],
+    separator: str = '-',
+    uppercase_first_letter: bool = True
+) -> str:
+    """
+    Apply `functions` in order to each line of `block`, which consists of
+    whole lines each terminated by a newline.
+    """
+    lines = block[:-1].split('\n')
+    for name in functions:
+        if name == 'camelize':
+            # lowerCamelCase of an empty string is undefined, so blank lines
+            # are passed through as they are.
+            camelized = iter(inflection.camelize_many(
+                [line for line in lines if line], uppercase_first_letter
+            ))
+            lines = [line and next(camelized) for line in lines]
+        elif name == 'parameterize':
+            lines = inflection.parameterize_many(lines, separator)
+        else:
+            lines = getattr(inflection, name + '_many')(lines)
+    return '\n'.join(lines) + '\n'
+
+
+def read_blocks(
+    files: typing.Iterable[typing.BinaryIO],
+    size: int = CHUNK_SIZE
+) -> typing.Iterator[str]:
+    """
+    Read `files` in chunks of about `size` characters and yield them as blocks
+    of whole lines, each terminated by a newline.
+    """
+    for file in files:
+        reader = io.TextIOWrapper(
+            file, encoding='utf-8', errors='surrogateescape', newline=None
+        )
+        pending = ''
+        while True:
+            chunk = reader.read(size)
+            if not chunk:
+                break
+            chunk = pending + chunk
+            end = chunk.rfind('\n') + 1
+            pending = chunk[end:]
+            if end:
+                yield chunk[:end]
+        if pending:
+            yield pending + '\n'
+        reader.detach()
+
+
+def open_inputs(
+    paths: typing.Sequence[str]
+) -> typing.Iterator[typing.BinaryIO]:
+    for path in paths or ['-']:
+        if path == '-':
+            yield sys.stdin.buffer
+        else:
+            with open(path, 'rb') as file:
+                yield file
+
+
+def parse_args(
+    argv: typing.Optional[typing.Sequence[str]] = None
+) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='inflection',
+        description=(
+            'Apply inflection functions to every line of the input files or '
+            'the standard input and write the results to the standard output.'
+        ),
+    )
+    parser.add_argument(
+        'functions',
+        metavar='FUNCTION[,FUNCTION...]',
+        type=lambda value: value.split(','),
+        help='functions to apply in order, one of: ' + ', '.join(FUNCTIONS),
+    )
+    parser.add_argument(
+        'files',
+        metavar='FILE',
+        nargs='*',
+        help='files to read, or - for the standard input (default)',
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='number of worker processes to use (default: 1)',
+    )
+    parser.add_argument(
+        '-s', '--separator',
+        default='-',
+        help='separator used by parameterize (default: -)',
+    )
+    parser.add_argument(
+        '-l', '--lower-first',
+        action='store_true',
+        help='make camelize produce lowerCamelCase',
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=CHUNK_SIZE,
+        help='number of characters to read at a time (default: %(default)s)',
+    )
+    # Files given after an option are left over by parse_args(), and
+    # parse_intermixed_args() is new in Python 3.7.
+    args, extra = parser.parse_known_args(argv)
+    options = [arg for arg in extra if arg.startswith('-') and arg != '-']
+    if options:
+        parser.error('unrecognized arguments: ' + ' '.join(options))
+    args.files.extend(extra)
+    unknown = [name for name in args.functions if name not in FUNCTIONS]
+    if unknown:
+        parser.error('unknown function: ' + ', '.join(unknown))
+    if args.jobs < 1 or args.chunk_size < 1:
+        parser.error('--jobs and --chunk-size must be positive')
+    return args
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    options = (args.functions, args.separator, not args.lower_first)
+    blocks = read_blocks(open_inputs(args.files), args.chunk_size)
+    output = sys.stdout.buffer
+
+    def write(block: str) -> None:
+        output.write(block.encode('utf-8', 'surrogateescape'))
+
+    if args.jobs == 1:
+        for block in blocks:
+            write(convert(block, *options))
+    else:
+        from concurrent.futures import Future, ProcessPoolExecutor
+
+        with ProcessPoolExecutor(args.jobs) as executor:
+            pending: typing.Deque['Future[str]'] = collections.deque()
+            for block in blocks:
+                pending.append(executor.submit(convert, block, *options))
+                # Keep a bounded number of blocks in flight.
+                if len(pending) > 2 * args.jobs:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+    output.flush()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
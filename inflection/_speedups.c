@@ -0,0 +1,429 @@
+/*
+ * inflection._speedups
+ * ~~~~~~~~~~~~~~~~~~~~
+ *
+ * C implementations of the simplest inflection functions for ASCII
+ * strings, and of the last step of transliterate().  Each function returns
+ * None for input it does not handle, such as non-ASCII strings, and the
+ * caller then falls back to the pure Python implementation.  The results
+ * are the same as those of the regular expressions in
+ * inflection/__init__.py.
+ *
+ * :copyright: (c) 2012-2020 by Janne Vanhala
+ *
+ * :license: MIT, see LICENSE for more details.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#define IS_UPPER(c) ((c) >= 'A' && (c) <= 'Z')
+#define IS_LOWER(c) ((c) >= 'a' && (c) <= 'z')
+#define IS_DIGIT(c) ((c) >= '0' && (c) <= '9')
+#define IS_ALLOWED(c) \
+    (IS_LOWER(c) || IS_UPPER(c) || IS_DIGIT(c) || (c) == '-' || (c) == '_')
+#define TO_LOWER(c) ((Py_UCS1)(IS_UPPER(c) ? (c) + ('a' - 'A') : (c)))
+#define TO_UPPER(c) ((Py_UCS1)(IS_LOWER(c) ? (c) - ('a' - 'A') : (c)))
+
+/* The module state is set once when the module is executed and never
+   changed afterwards, so the functions need no locking without the GIL. */
+typedef struct {
+    PyObject *suffix_st, *suffix_nd, *suffix_rd, *suffix_th;
+} speedups_state;
+
+static speedups_state *
+get_state(PyObject *module)
+{
+    return (speedups_state *)PyModule_GetState(module);
+}
+
+/* Return whether object is an ASCII str, or -1 on error. */
+static int
+is_ascii(PyObject *object)
+{
+    if (!PyUnicode_Check(object)) {
+        return 0;
+    }
+#if PY_VERSION_HEX < 0x030C0000
+    if (PyUnicode_READY(object) == -1) {
+        return -1;
+    }
+#endif
+    return PyUnicode_IS_ASCII(object);
+}
+
+/* Shrink a string made with PyUnicode_New() to the length written. */
+static PyObject *
+finish(PyObject *result, Py_ssize_t length)
+{
+    if (length != PyUnicode_GET_LENGTH(result) &&
+            PyUnicode_Resize(&result, length) == -1) {
+        return NULL;
+    }
+    return result;
+}
+
+static PyObject *
+underscore(PyObject *module, PyObject *word)
+{
+    int ascii = is_ascii(word);
+    if (ascii != 1) {
+        if (ascii == -1) {
+            return NULL;
+        }
+        Py_RETURN_NONE;
+    }
+    Py_ssize_t length = PyUnicode_GET_LENGTH(word);
+    if (length > PY_SSIZE_T_MAX / 2) {
+        Py_RETURN_NONE;
+    }
+    const Py_UCS1 *in = PyUnicode_1BYTE_DATA(word);
+    PyObject *result = PyUnicode_New(2 * length, 127);
+    if (result == NULL) {
+        return NULL;
+    }
+    Py_UCS1 *out = PyUnicode_1BYTE_DATA(result);
+    Py_ssize_t written = 0;
+    for (Py_ssize_t i = 0; i < length; i++) {
+        Py_UCS1 c = in[i];
+        if (c == '-' || c == '_') {
+            out[written++] = '_';
+            continue;
+        }
+        if (i > 0 && IS_UPPER(c)) {
+            Py_UCS1 previous = in[i - 1];
+            /* "aB" and "1B" become "a_b" and "1_b", "ABc" becomes "a_bc". */
+            if (IS_LOWER(previous) || IS_DIGIT(previous) ||
+                    (IS_UPPER(previous) && i + 1 < length &&
+                     IS_LOWER(in[i + 1]))) {
+                out[written++] = '_';
+            }
+        }
+        out[written++] = TO_LOWER(c);
+    }
+    return finish(result, written);
+}
+
+static PyObject *
+camelize(PyObject *module, PyObject *const *args, Py_ssize_t nargs)
+{
+    if (nargs < 1 || nargs > 2) {
+        Py_RETURN_NONE;
+    }
+    PyObject *string = args[0];
+    int uppercase_first_letter = 1;
+    if (nargs == 2) {
+        uppercase_first_letter = PyObject_IsTrue(args[1]);
+        if (uppercase_first_letter == -1) {
+            return NULL;
+        }
+    }
+    int ascii = is_ascii(string);
+    if (ascii != 1) {
+        if (ascii == -1) {
+            return NULL;
+        }
+        Py_RETURN_NONE;
+    }
+    Py_ssize_t length = PyUnicode_GET_LENGTH(string);
+    if (length == 0) {
+        /* lowerCamelCase of an empty string raises IndexError in Python. */
+        if (uppercase_first_letter) {
+            Py_INCREF(string);
+            return string;
+        }
+        Py_RETURN_NONE;
+    }
+    const Py_UCS1 *in = PyUnicode_1BYTE_DATA(string);
+    PyObject *result = PyUnicode_New(length, 127);
+    if (result == NULL) {
+        return NULL;
+    }
+    Py_UCS1 *out = PyUnicode_1BYTE_DATA(result);
+    Py_ssize_t written = 0;
+    Py_ssize_t i = 0;
+    /* Like re.sub(r"(?:^|_)(.)", ...): the first character and any
+       character after an underscore are uppercased, except newlines. */
+    if (in[0] != '\n') {
+        out[written++] = TO_UPPER(in[0]);
+        i = 1;
+    }
+    while (i < length) {
+        if (in[i] == '_' && i + 1 < length && in[i + 1] != '\n') {
+            out[written++] = TO_UPPER(in[i + 1]);
+            i += 2;
+        }
+        else {
+            out[written++] = in[i++];
+        }
+    }
+    if (!uppercase_first_letter) {
+        out[0] = TO_LOWER(in[0]);
+    }
+    return finish(result, written);
+}
+
+static PyObject *
+parameterize(PyObject *module, PyObject *const *args, Py_ssize_t nargs)
+{
+    if (nargs < 1 || nargs > 2) {
+        Py_RETURN_NONE;
+    }
+    PyObject *string = args[0];
+    Py_UCS1 separator = '-';
+    int has_separator = 1;
+    if (nargs == 2) {
+        int ascii = is_ascii(args[1]);
+        if (ascii == -1) {
+            return NULL;
+        }
+        if (!ascii || PyUnicode_GET_LENGTH(args[1]) > 1) {
+            Py_RETURN_NONE;
+        }
+        if (PyUnicode_GET_LENGTH(args[1]) == 0) {
+            has_separator = 0;
+        }
+        else {
+            separator = PyUnicode_1BYTE_DATA(args[1])[0];
+            /* Letters are matched case-insensitively when stripped. */
+            if (IS_LOWER(separator) || IS_UPPER(separator)) {
+                Py_RETURN_NONE;
+            }
+        }
+    }
+    int ascii = is_ascii(string);
+    if (ascii != 1) {
+        if (ascii == -1) {
+            return NULL;
+        }
+        Py_RETURN_NONE;
+    }
+    Py_ssize_t length = PyUnicode_GET_LENGTH(string);
+    const Py_UCS1 *in = PyUnicode_1BYTE_DATA(string);
+    PyObject *result = PyUnicode_New(length, 127);
+    if (result == NULL) {
+        return NULL;
+    }
+    Py_UCS1 *out = PyUnicode_1BYTE_DATA(result);
+    Py_ssize_t written = 0;
+    int pending = 0;
+    /* The runs of allowed characters other than the separator, lowercased
+       and joined by the separator. */
+    for (Py_ssize_t i = 0; i < length; i++) {
+        Py_UCS1 c = in[i];
+        if (!IS_ALLOWED(c) || (has_separator && c == separator)) {
+            pending = has_separator;
+            continue;
+        }
+        if (pending && written > 0) {
+            out[written++] = separator;
+        }
+        pending = 0;
+        out[written++] = TO_LOWER(c);
+    }
+    return finish(result, written);
+}
+
+/* The ASCII approximation of a letter in _APPROXIMATIONS, or NULL. */
+static const char *
+approximation(Py_UCS4 c)
+{
+    switch (c) {
+    case 0x00C6: return "AE";
+    case 0x00E6: return "ae";
+    case 0x00D0: return "D";
+    case 0x00F0: return "d";
+    case 0x00D8: return "O";
+    case 0x00F8: return "o";
+    case 0x00DE: return "Th";
+    case 0x00FE: return "th";
+    case 0x00DF: return "ss";
+    case 0x1E9E: return "SS";
+    case 0x0110: return "D";
+    case 0x0111: return "d";
+    case 0x0126: return "H";
+    case 0x0127: return "h";
+    case 0x0131: return "i";
+    case 0x0138: return "k";
+    case 0x0141: return "L";
+    case 0x0142: return "l";
+    case 0x014A: return "NG";
+    case 0x014B: return "ng";
+    case 0x0152: return "OE";
+    case 0x0153: return "oe";
+    case 0x0166: return "T";
+    case 0x0167: return "t";
+    default: return NULL;
+    }
+}
+
+/* The ASCII characters of a string, with the letters in _APPROXIMATIONS
+   replaced by their approximations and the other characters dropped. */
+static PyObject *
+to_ascii(PyObject *module, PyObject *string)
+{
+    if (!PyUnicode_Check(string)) {
+        Py_RETURN_NONE;
+    }
+#if PY_VERSION_HEX < 0x030C0000
+    if (PyUnicode_READY(string) == -1) {
+        return NULL;
+    }
+#endif
+    Py_ssize_t length = PyUnicode_GET_LENGTH(string);
+    int kind = PyUnicode_KIND(string);
+    const void *in = PyUnicode_DATA(string);
+    Py_ssize_t size = 0;
+    for (Py_ssize_t i = 0; i < length; i++) {
+        Py_UCS4 c = PyUnicode_READ(kind, in, i);
+        if (c < 128) {
+            size++;
+        }
+        else {
+            const char *text = approximation(c);
+            if (text != NULL) {
+                size += (Py_ssize_t)strlen(text);
+            }
+        }
+    }
+    PyObject *result = PyUnicode_New(size, 127);
+    if (result == NULL) {
+        return NULL;
+    }
+    Py_UCS1 *out = PyUnicode_1BYTE_DATA(result);
+    for (Py_ssize_t i = 0; i < length; i++) {
+        Py_UCS4 c = PyUnicode_READ(kind, in, i);
+        if (c < 128) {
+            *out++ = (Py_UCS1)c;
+        }
+        else {
+            const char *text = approximation(c);
+            while (text != NULL && *text) {
+                *out++ = (Py_UCS1)*text++;
+            }
+        }
+    }
+    return result;
+}
+
+static PyObject *
+ordinal(PyObject *module, PyObject *number)
+{
+    if (!PyLong_CheckExact(number)) {
+        Py_RETURN_NONE;
+    }
+    int overflow;
+    long long value = PyLong_AsLongLongAndOverflow(number, &overflow);
+    if (value == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+    if (overflow) {
+        Py_RETURN_NONE;
+    }
+    unsigned long long magnitude = value < 0 ?
+        0ULL - (unsigned long long)value : (unsigned long long)value;
+    speedups_state *state = get_state(module);
+    PyObject *suffix;
+    if (magnitude % 100 >= 11 && magnitude % 100 <= 13) {
+        suffix = state->suffix_th;
+    }
+    else {
+        switch (magnitude % 10) {
+        case 1: suffix = state->suffix_st; break;
+        case 2: suffix = state->suffix_nd; break;
+        case 3: suffix = state->suffix_rd; break;
+        default: suffix = state->suffix_th;
+        }
+    }
+    Py_INCREF(suffix);
+    return suffix;
+}
+
+static PyMethodDef speedups_methods[] = {
+    {"underscore", (PyCFunction)underscore, METH_O,
+     "underscore(word) for ASCII words, otherwise None."},
+    {"camelize", (PyCFunction)(void (*)(void))camelize, METH_FASTCALL,
+     "camelize(string, uppercase_first_letter=True) for ASCII strings, "
+     "otherwise None."},
+    {"parameterize", (PyCFunction)(void (*)(void))parameterize,
+     METH_FASTCALL,
+     "parameterize(string, separator='-') for ASCII strings and separators "
+     "of at most one character other than a letter, otherwise None."},
+    {"to_ascii", (PyCFunction)to_ascii, METH_O,
+     "to_ascii(string) for str strings already normalized to NFKD by "
+     "transliterate(), otherwise None."},
+    {"ordinal", (PyCFunction)ordinal, METH_O,
+     "ordinal(number) for int numbers, otherwise None."},
+    {NULL, NULL, 0, NULL}
+};
+
+static int
+speedups_exec(PyObject *module)
+{
+    speedups_state *state = get_state(module);
+    state->suffix_st = PyUnicode_InternFromString("st");
+    state->suffix_nd = PyUnicode_InternFromString("nd");
+    state->suffix_rd = PyUnicode_InternFromString("rd");
+    state->suffix_th = PyUnicode_InternFromString("th");
+    if (state->suffix_st == NULL || state->suffix_nd == NULL ||
+            state->suffix_rd == NULL || state->suffix_th == NULL) {
+        return -1;
+    }
+    return 0;
+}
+
+static int
+speedups_traverse(PyObject *module, visitproc visit, void *arg)
+{
+    speedups_state *state = get_state(module);
+    Py_VISIT(state->suffix_st);
+    Py_VISIT(state->suffix_nd);
+    Py_VISIT(state->suffix_rd);
+    Py_VISIT(state->suffix_th);
+    return 0;
+}
+
+static int
+speedups_clear(PyObject *module)
+{
+    speedups_state *state = get_state(module);
+    Py_CLEAR(state->suffix_st);
+    Py_CLEAR(state->suffix_nd);
+    Py_CLEAR(state->suffix_rd);
+    Py_CLEAR(state->suffix_th);
+    return 0;
+}
+
+static void
+speedups_free(void *module)
+{
+    speedups_clear((PyObject *)module);
+}
+
+static PyModuleDef_Slot speedups_slots[] = {
+    {Py_mod_exec, speedups_exec},
+#ifdef Py_mod_multiple_interpreters
+    {Py_mod_multiple_interpreters, Py_MOD_PER_INTERPRETER_GIL_SUPPORTED},
+#endif
+#ifdef Py_GIL_DISABLED
+    {Py_mod_gil, Py_MOD_GIL_NOT_USED},
+#endif
+    {0, NULL}
+};
+
+static struct PyModuleDef speedups_module = {
+    PyModuleDef_HEAD_INIT,
+    "inflection._speedups",
+    "C implementations of inflection functions for ASCII strings.",
+    sizeof(speedups_state),
+    speedups_methods,
+    speedups_slots,
+    speedups_traverse,
+    speedups_clear,
+    speedups_free
+};
+
+PyMODINIT_FUNC
+PyInit__speedups(void)
+{
+    return PyModuleDef_Init(&speedups_module);
+}
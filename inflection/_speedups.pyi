@@ -0,0 +1,11 @@
+import typing
+
+def underscore(word: str) -> typing.Optional[str]: ...
+def camelize(
+    string: str, uppercase_first_letter: bool = ...
+) -> typing.Optional[str]: ...
+def parameterize(
+    string: str, separator: str = ...
+) -> typing.Optional[str]: ...
+def to_ascii(string: str) -> typing.Optional[str]: ...
+def ordinal(number: int) -> typing.Optional[str]: ...
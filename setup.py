@@ -1,7 +1,23 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import platform
+import sys
 
-from setuptools import setup
+from setuptools import Extension, setup
+
+# The C extension only speeds up CPython, and it is optional: if it cannot
+# be built, the pure Python implementation is used.  It uses the
+# METH_FASTCALL calling convention of Python 3.7 and later.
+ext_modules = []
+if (
+    platform.python_implementation() == 'CPython' and
+    sys.version_info >= (3, 7)
+):
+    ext_modules.append(Extension(
+        'inflection._speedups',
+        sources=['inflection/_speedups.c'],
+        optional=True,
+    ))
 
 if __name__ == "__main__":
-    setup()
+    setup(ext_modules=ext_modules)
@@ -1,12 +1,34 @@
 # -*- coding: utf-8 -*-
+import functools
+import importlib.util
+import io
+import itertools
+import pathlib
+import re
+import threading
 import typing
 
 import pytest
 
 import inflection
+import inflection.__main__ as inflection_main
 
 TestParameters = typing.Tuple[typing.Tuple[str, str], ...]
 
+
+@pytest.fixture(
+    autouse=True,
+    params=["python"] + (["speedups"] if inflection._SPEEDUPS else []),
+)
+def backend(
+    request: pytest.FixtureRequest,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Run every test with and without the optional C extension."""
+    if request.param == "python":
+        monkeypatch.setattr(inflection, "_SPEEDUPS", False)
+
+
 SINGULAR_TO_PLURAL: TestParameters = (
     ("search", "searches"),
     ("switch", "switches"),
@@ -173,8 +195,9 @@ STRING_TO_PARAMETERIZED_AND_NORMALIZED: TestParameters = (
     (u"Malmö", "malmo"),
     (u"Garçons", "garcons"),
     (u"Ops\331", "opsu"),
-    (u"Ærøskøbing", "rskbing"),
-    (u"Aßlar", "alar"),
+    (u"Ærøskøbing", "aeroskobing"),
+    (u"Aßlar", "asslar"),
+    (u"Łódź", "lodz"),
     (u"Japanese: 日本語", "japanese"),
 )
 
@@ -197,6 +220,12 @@ MIXTURE_TO_TITLEIZED: TestParameters = (
     ("david's Code",          "David's Code"),
     ("ana índia",             "Ana Índia"),
     ("Ana Índia",             "Ana Índia"),
+    ("TheManWithoutAPast",    "The Man Without A Past"),
+    ("HTMLParser_v2",         "Html Parser V2"),
+    ("author_id",             "Author"),
+    ("AuthorID",              "Author"),
+    ("x-men: the last stand", "X Men: The Last Stand"),
+    ("don't-stop_believin'",  "Don't Stop Believin'"),
 )
 
 
@@ -356,6 +385,32 @@ def test_camelize_with_underscores() -> None:
     assert "CamelCase" == inflection.camelize('Camel_Case')
 
 
+@pytest.mark.parametrize(
+    ("string", "upper_camel", "lower_camel"),
+    [
+        ("_private_key", "_privateKey", "_privateKey"),
+        ("double__underscore", "Double_underscore", "double_underscore"),
+        ("trailing_", "Trailing_", "trailing_"),
+        ("line_\nbreak", "Line_\nbreak", "line_\nbreak"),
+        ("version_2_api", "Version2Api", "version2Api"),
+        ("straße_name", "StraßeName", "straßeName"),
+        ("ßtraße_name", "SStraßeName", "ßStraßeName"),
+        ("_", "_", "_"),
+    ]
+)
+def test_camelize_edge_cases(
+    string: str, upper_camel: str, lower_camel: str
+) -> None:
+    assert upper_camel == inflection.camelize(string)
+    assert lower_camel == inflection.camelize(string, False)
+
+
+def test_camelize_empty_string() -> None:
+    assert "" == inflection.camelize("")
+    with pytest.raises(IndexError):
+        inflection.camelize("", False)
+
+
 @pytest.mark.parametrize(
     ("camel", "underscore"),
     CAMEL_TO_UNDERSCORE + CAMEL_TO_UNDERSCORE_WITHOUT_REVERSE
@@ -380,6 +435,18 @@ def test_parameterize_and_normalize(some_string: str, parameterized_string: str)
     assert parameterized_string == inflection.parameterize(some_string)
 
 
+@pytest.mark.parametrize(
+    ("letter", "approximation"), sorted(inflection._APPROXIMATIONS.items())
+)
+def test_transliterate_approximates_letters(
+    letter: str,
+    approximation: str
+) -> None:
+    assert "o%se" % approximation == (
+        inflection.transliterate("ö%sé日" % letter)
+    )
+
+
 @pytest.mark.parametrize(
     ("some_string", "parameterized_string"),
     STRING_TO_PARAMETERIZE_WITH_UNDERSCORE
@@ -433,3 +500,944 @@ def test_dasherize(input: str, expected: str) -> None:
 @pytest.mark.parametrize(("string", "tableized"), STRING_TO_TABLEIZE)
 def test_tableize(string: str, tableized: str) -> None:
     assert inflection.tableize(string) == tableized
+
+
+def test_pluralize_picks_up_rules_added_after_use() -> None:
+    assert "sheeps" == inflection.pluralize("sheeps")
+    inflection.PLURALS.insert(0, (r"(?i)(sheep)s$", r"\1"))
+    try:
+        assert "sheep" == inflection.pluralize("sheeps")
+    finally:
+        inflection.PLURALS.pop(0)
+    assert "sheeps" == inflection.pluralize("sheeps")
+
+
+def test_singularize_picks_up_replaced_rule_list() -> None:
+    singulars = inflection.SINGULARS
+    inflection.SINGULARS = [(r"(?i)(ba)nanas$", r"\1nana")]
+    try:
+        assert "banana" == inflection.singularize("bananas")
+        assert "posts" == inflection.singularize("posts")
+        inflection.SINGULARS.append((r"(?i)s$", ""))
+        assert "post" == inflection.singularize("posts")
+    finally:
+        inflection.SINGULARS = singulars
+
+
+def test_rule_replacement_applies_to_every_match() -> None:
+    inflection.PLURALS.insert(0, (r"(?i)(es)?$", "s"))
+    try:
+        assert "wordss" == inflection.pluralize("wordes")
+    finally:
+        inflection.PLURALS.pop(0)
+
+
+def test_pluralize_tries_general_rules_before_later_specific_ones() -> None:
+    inflection.PLURALS.insert(0, (r"(?i)(o)$", r"\1s"))
+    try:
+        assert "potatos" == inflection.pluralize("potato")
+        assert "octopi" == inflection.pluralize("octopus")
+    finally:
+        inflection.PLURALS.pop(0)
+
+
+@pytest.mark.parametrize(
+    ("word", "plural"),
+    [
+        ("person\n", "people\n"),
+        ("Ærø", "Ærøs"),
+        ("STATUS", "STATUSes"),
+        ("Ærøperson", "Ærøpeople"),
+        # Letters that ASCII letters match case-insensitively.
+        ("statu\u017f", "statu\u017fes"),
+        ("octopu\u017f", "octopi"),
+        ("\u212aNIFE", "\u212aNIves"),
+        ("C\u0131ty", "C\u0131ties"),
+    ]
+)
+def test_pluralize_words_the_suffix_index_must_not_miss(
+    word: str,
+    plural: str
+) -> None:
+    assert plural == inflection.pluralize(word)
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        r"(?i)\x65s$",
+        r"(?i)\u0065s$",
+        r"(?i)\145s$",
+        r"(?i)\N{LATIN SMALL LETTER E}s$",
+    ]
+)
+def test_rules_with_long_escapes_are_tried(rule: str) -> None:
+    inflector = inflection.Inflector([(rule, "X"), (r"(?i)$", "s")])
+    assert "X" == inflector.pluralize("es")
+    assert "boxs" == inflector.pluralize("box")
+
+
+@pytest.mark.parametrize(
+    ("word", "singular"),
+    [
+        ("black sheep", "black sheep"),
+        ("black_sheep", "black_sheep"),
+        ("BlackSheep", "BlackSheep"),
+        ("blacksheeps", "blacksheep"),
+        ("FISH", "FISH"),
+        ("jean\u017f", "jean\u017f"),
+        ("blue jean\u017f", "blue jean\u017f"),
+    ]
+)
+def test_singularize_uncountable_last_word(word: str, singular: str) -> None:
+    assert singular == inflection.singularize(word)
+
+
+@pytest.mark.parametrize("word", ["r\u0131ce", "R\u0130CE", "brown r\u0131ce"])
+def test_uncountables_match_case_insensitively_like_regexes(word: str) -> None:
+    inflector = inflection.Inflector(
+        singulars=[(r"(?i)e$", "")], uncountables={"rice"}
+    )
+    assert word == inflector.singularize(word)
+
+
+def test_uncountables_added_in_bulk_are_picked_up() -> None:
+    words = {"gravel", "wheat"}
+    inflection.UNCOUNTABLES.update(words)
+    try:
+        assert "gravel" == inflection.pluralize("gravel")
+        assert "Wheat" == inflection.pluralize("Wheat")
+        assert "crushed_gravel" == inflection.singularize("crushed_gravel")
+    finally:
+        inflection.UNCOUNTABLES -= words
+    assert "gravels" == inflection.pluralize("gravel")
+
+
+@pytest.fixture
+def cache() -> typing.Iterator[None]:
+    inflection.enable_cache(maxsize=2)
+    try:
+        yield
+    finally:
+        inflection.disable_cache()
+
+
+@pytest.mark.usefixtures("cache")
+def test_cache_counts_hits_misses_and_evictions() -> None:
+    assert "posts" == inflection.pluralize("post")
+    assert "posts" == inflection.pluralize("post")
+    assert "posts" == inflection.underscore("Posts")
+    assert "post_item" == inflection.underscore("PostItem")
+    assert (1, 3, 1, 2, 2) == inflection.cache_info()
+    inflection.cache_clear()
+    assert (0, 0, 0, 2, 0) == inflection.cache_info()
+
+
+@pytest.mark.usefixtures("cache")
+def test_cache_is_cleared_when_rules_change() -> None:
+    assert "gravels" == inflection.pluralize("gravel")
+    assert "cacti" == inflection.singularize("cacti")
+    inflection.UNCOUNTABLES.add("gravel")
+    try:
+        assert "gravel" == inflection.pluralize("gravel")
+        inflection._irregular("cactus", "cacti")
+        assert "cactus" == inflection.singularize("cacti")
+        assert 0 == inflection.cache_info().hits
+    finally:
+        inflection.UNCOUNTABLES.remove("gravel")
+        del inflection.PLURALS[:2]
+        del inflection.SINGULARS[:1]
+
+
+def test_cache_drops_results_computed_with_old_rules() -> None:
+    cache = inflection._LRUCache(maxsize=2)
+    _, _, rules = cache.lookup("gravel")
+    inflection.UNCOUNTABLES.add("gravel")
+    try:
+        # Another lookup clears the results of the old rules before the
+        # result computed with them is stored.
+        cache.lookup("sand")
+        cache.store("gravel", "gravels", rules)
+        assert (False, None) == cache.lookup("gravel")[:2]
+    finally:
+        inflection.UNCOUNTABLES.remove("gravel")
+
+
+def test_cache_info_when_cache_is_disabled() -> None:
+    assert (0, 0, 0, 0, 0) == inflection.cache_info()
+
+
+def test_enable_cache_with_invalid_size() -> None:
+    with pytest.raises(ValueError):
+        inflection.enable_cache(maxsize=0)
+
+
+@pytest.mark.parametrize(
+    ("name", "inputs"),
+    [
+        ("camelize", [underscore for _, underscore in CAMEL_TO_UNDERSCORE]),
+        ("dasherize", [input for input, _ in UNDERSCORES_TO_DASHES]),
+        ("humanize", [underscore for underscore, _ in UNDERSCORE_TO_HUMAN]),
+        ("parameterize", [string for string, _ in STRING_TO_PARAMETERIZED]),
+        ("pluralize", [singular for singular, _ in SINGULAR_TO_PLURAL]),
+        ("singularize", [plural for _, plural in SINGULAR_TO_PLURAL]),
+        ("tableize", [string for string, _ in STRING_TO_TABLEIZE]),
+        ("titleize", [before for before, _ in MIXTURE_TO_TITLEIZED]),
+        (
+            "transliterate",
+            [string for string, _ in STRING_TO_PARAMETERIZED_AND_NORMALIZED]
+        ),
+        (
+            "underscore",
+            [camel for camel, _ in CAMEL_TO_UNDERSCORE_WITHOUT_REVERSE] +
+            ["already_underscored", "with-dashes"]
+        ),
+    ]
+)
+def test_many_matches_single_calls(
+    name: str,
+    inputs: typing.List[str]
+) -> None:
+    function = getattr(inflection, name)
+    inputs = inputs + inputs[::-1]
+    assert [function(input) for input in inputs] == (
+        getattr(inflection, name + "_many")(iter(inputs))
+    )
+
+
+def test_many_with_extra_arguments() -> None:
+    assert ["deviceType", "device"] == (
+        inflection.camelize_many(["device_type", "device"], False)
+    )
+    assert ["donald_e_knuth"] == (
+        inflection.parameterize_many(["Donald E. Knuth"], "_")
+    )
+    assert ["1st", "22nd"] == inflection.ordinalize_many([1, 22])
+    assert ["st", "nd"] == inflection.ordinal_many([1, 22])
+
+
+def test_stream_keeps_line_endings() -> None:
+    lines = io.StringIO("DeviceType\nProductTitle\r\n\nDeviceType")
+    assert [
+        "device-types\n", "product-titles\r\n", "\n", "device-types"
+    ] == list(inflection.stream(
+        lines, inflection.underscore, inflection.pluralize,
+        inflection.dasherize
+    ))
+
+
+def test_stream_is_lazy() -> None:
+    lines = itertools.cycle(["Person\n", "Octopus\n"])
+    assert ["people\n", "octopi\n", "people\n"] == list(
+        itertools.islice(
+            inflection.stream(lines, inflection.tableize, memo_size=1), 3
+        )
+    )
+
+
+def test_interner_shares_results() -> None:
+    interner = inflection.Interner(inflection.humanize)
+    first = interner(["employee_salary", "Employee salary", "author_id"])
+    second = interner(["employee_" + "salary"])
+    assert ["Employee salary", "Employee salary", "Author"] == first
+    assert first[0] is first[1] is second[0]
+    assert inflection.InternInfo(4, 3, 3) == interner.info()
+    assert 4 / 3 == interner.info().ratio
+
+    interner.clear()
+    assert inflection.InternInfo(0, 0, 0) == interner.info()
+    assert 0.0 == interner.info().ratio
+
+
+def test_interner_computes_each_distinct_string_once() -> None:
+    calls = []
+
+    def function(string: str) -> str:
+        calls.append(string)
+        return inflection.camelize(string)
+
+    interner = inflection.Interner(function, maxsize=2)
+    assert ["DeviceType", "DeviceId", "DeviceType"] == (
+        interner(["device_type", "device_id", "device_type"])
+    )
+    assert ["DeviceId"] == interner(["device_id"])
+    assert ["device_type", "device_id"] == calls
+    # Remembering a third string forgets the others.
+    assert ["A", "DeviceType"] == interner(["a", "device_type"])
+    assert ["device_type", "device_id", "a"] == calls
+    assert 1 == interner.info().currsize
+
+    with pytest.raises(ValueError):
+        inflection.Interner(function, maxsize=0)
+
+
+def test_interner_forgets_results_when_rules_change() -> None:
+    interner = inflection.Interner(inflection.tableize)
+    assert ["boats"] == interner(["Boat"])
+    inflection._irregular("boat", "boaten")
+    try:
+        assert ["boaten"] == interner(["Boat"])
+    finally:
+        del inflection.PLURALS[:2]
+        del inflection.SINGULARS[:1]
+    assert ["boats"] == interner(["Boat"])
+
+
+def test_interner_forgets_results_when_inflector_rules_change() -> None:
+    inflector = inflection.Inflector(plurals=[(r"(?i)$", "s")])
+    interner = inflection.Interner(inflector.pluralize)
+    assert ["oxs"] == interner(["ox"])
+    inflector.irregular("ox", "oxen")
+    assert ["oxen"] == interner(["ox"])
+
+
+def test_interner_drops_results_of_rules_changed_meanwhile() -> None:
+    def pluralize(word: str) -> str:
+        result = inflection.pluralize(word)
+        if word == "gravel":
+            # Another thread changes the rules and converts with the new
+            # ones while the word is converted.
+            inflection.UNCOUNTABLES.add("gravel")
+            assert ["sands"] == interner(["sand"])
+        return result
+
+    interner = inflection.Interner(pluralize)
+    try:
+        assert ["gravels"] == interner(["gravel"])
+        assert ["gravel"] == interner(["gravel"])
+    finally:
+        inflection.UNCOUNTABLES.remove("gravel")
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_command_line(
+    jobs: str,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsysbinary: pytest.CaptureFixture[bytes]
+) -> None:
+    path = tmp_path / "names.txt"
+    path.write_bytes("DeviceType\r\nPerson\n\nÆrø Køb\nOctopus".encode())
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(b"Cow\n")))
+
+    assert 0 == inflection_main.main([
+        "tableize,dasherize", str(path), "-", "--jobs", jobs,
+        "--chunk-size", "4"
+    ])
+
+    assert capsysbinary.readouterr().out == (
+        "device-types\npeople\n\nærø købs\noctopi\nkine\n".encode()
+    )
+
+
+def test_command_line_with_options(
+    tmp_path: pathlib.Path,
+    capsysbinary: pytest.CaptureFixture[bytes]
+) -> None:
+    path = tmp_path / "names.txt"
+    path.write_text("device_type\nDonald E. Knuth\n")
+
+    inflection_main.main(["camelize,parameterize", "-l", "-s", "_", str(path)])
+
+    assert b"devicetype\ndonald_e_knuth\n" == capsysbinary.readouterr().out
+
+
+def test_command_line_keeps_blank_lines_in_lower_camel_case(
+    tmp_path: pathlib.Path,
+    capsysbinary: pytest.CaptureFixture[bytes]
+) -> None:
+    first = tmp_path / "first.txt"
+    first.write_text("device_type\n\nfoo_bar\n")
+    second = tmp_path / "second.txt"
+    second.write_text("\nuser_id\n")
+
+    inflection_main.main(["camelize", str(first), "-l", str(second)])
+
+    assert b"deviceType\n\nfooBar\n\nuserId\n" == (
+        capsysbinary.readouterr().out
+    )
+
+
+def test_command_line_rejects_unknown_functions() -> None:
+    with pytest.raises(SystemExit):
+        inflection_main.main(["underscore,frobnicate"])
+
+
+def test_command_line_rejects_unknown_options() -> None:
+    with pytest.raises(SystemExit):
+        inflection_main.main(["underscore", "names.txt", "--frobnicate"])
+
+
+def test_parallel_map_uses_custom_rules() -> None:
+    words = ["Cactus", "Person", "DeviceType"] * 5
+    inflection._irregular("cactus", "cacti")
+    try:
+        assert ["cacti", "people", "device_types"] * 5 == (
+            inflection.parallel_map(
+                inflection.tableize, words, workers=2, chunksize=2
+            )
+        )
+    finally:
+        del inflection.PLURALS[:2]
+        del inflection.SINGULARS[:1]
+
+
+def test_parallel_map_with_partial_function() -> None:
+    function = functools.partial(inflection.parameterize, separator="_")
+    assert ["donald_e_knuth", "a_b"] == (
+        inflection.parallel_map(function, ["Donald E. Knuth", "a b"], 2)
+    )
+    assert [] == inflection.parallel_map(function, [], 2)
+
+
+def test_map_array_keeps_the_shape() -> None:
+    numpy = pytest.importorskip("numpy")
+    values = numpy.array([["DeviceType", "IOError"], ["Person", "DeviceType"]])
+    result = numpy.asarray(inflection.map_array(inflection.tableize, values))
+    assert object == result.dtype
+    assert [["device_types", "io_errors"], ["people", "device_types"]] == (
+        result.tolist()
+    )
+
+
+@pytest.mark.parametrize(
+    "function",
+    [
+        inflection.underscore,
+        inflection.tableize,
+        functools.partial(inflection.parameterize, separator="_"),
+    ]
+)
+def test_map_array_matches_the_function(
+    function: typing.Callable[[str], str]
+) -> None:
+    pytest.importorskip("numpy")
+    values = ["Donald E. Knuth", "HTMLTidy", "", "Ærøskøbing"] * 3
+    assert [function(value) for value in values] == (
+        list(inflection.map_array(function, values))
+    )
+    assert [] == list(inflection.map_array(function, []))
+
+
+def test_map_array_of_other_iterables() -> None:
+    pytest.importorskip("numpy")
+    words = ["DeviceType", "IOError"]
+    assert ["device_type", "io_error"] == list(
+        inflection.map_array(inflection.underscore, (word for word in words))
+    )
+    assert ["device_type"] == list(
+        inflection.map_array(inflection.underscore, {"DeviceType"})
+    )
+    # Strings are not copied into a fixed-width array that strips NULs.
+    assert ["a_b\x00"] == list(
+        inflection.map_array(inflection.underscore, ["A-b\x00"])
+    )
+
+
+@pytest.mark.parametrize(
+    ("separator", "parameterized_string"),
+    [
+        (".", "with-some-dashes.underscores__.v2"),
+        ("2", "with-some-dashes2underscores__2v"),
+        ("::", "with-some-dashes::underscores__::v2"),
+    ]
+)
+def test_parameterize_with_other_separators(
+    separator: str,
+    parameterized_string: str
+) -> None:
+    assert parameterized_string == inflection.parameterize(
+        "..With-some-dashes & underscores__ V2!", separator
+    )
+
+
+def test_inflectors_have_separate_rules() -> None:
+    inflector = inflection.Inflector(
+        plurals=[(r"(?i)$", "s")],
+        singulars=[(r"(?i)s$", "")],
+        uncountables=["sheep"],
+    )
+    inflector.irregular("cactus", "cacti")
+
+    assert ["cacti", "octopuss", "sheep"] == [
+        inflector.pluralize(word) for word in ["cactus", "octopus", "sheep"]
+    ]
+    assert ["cactus", "car", "sheep"] == inflector.singularize_many(
+        ["cacti", "cars", "sheep"]
+    )
+    assert "octopi" == inflection.pluralize("octopus")
+    assert "persons" == inflector.pluralize("person")
+    assert "people" == inflection.pluralize("person")
+    assert "sheeps" == inflection.inflections().pluralize("sheeps")
+
+
+def test_inflector_recompiles_changed_rules() -> None:
+    inflector = inflection.Inflector(plurals=[(r"(?i)$", "s")])
+    assert "boxs" == inflector.pluralize("box")
+
+    inflector.plurals.insert(0, (r"(?i)x$", "xes"))
+    assert "boxes" == inflector.pluralize("box")
+
+    inflector.uncountables.add("box")
+    assert "box" == inflector.pluralize("box")
+
+
+def test_inflections_registry() -> None:
+    assert inflection.inflections() is inflection.inflections("en")
+    assert "posts" == inflection.inflections("en").pluralize("post")
+
+    inflector = inflection.inflections("test-locale")
+    assert inflector is inflection.inflections("test-locale")
+    assert [] == inflector.plurals
+    assert "post" == inflector.pluralize("post")
+
+
+def test_frozen_inflector_rejects_changes() -> None:
+    inflector = inflection.Inflector(
+        plurals=[(r"(?i)$", "s")],
+        uncountables=["sheep"],
+    ).freeze()
+
+    with pytest.raises(TypeError):
+        inflector.plurals.insert(0, (r"(?i)x$", "xes"))
+    with pytest.raises(TypeError):
+        inflector.irregular("person", "people")
+    with pytest.raises(TypeError):
+        inflector.uncountables.discard("sheep")
+    assert ["boxs", "sheep"] == inflector.pluralize_many(["box", "sheep"])
+
+
+def test_parallel_map_with_inflector() -> None:
+    inflector = inflection.Inflector(plurals=[(r"(?i)$", "s")]).freeze()
+    assert ["boxs", "cars"] * 3 == inflection.parallel_map(
+        inflector.pluralize, ["box", "car"] * 3, workers=2, chunksize=2
+    )
+
+
+def test_concurrent_conversions_while_rules_change() -> None:
+    inflector = inflection.Inflector(
+        inflection.PLURALS, inflection.SINGULARS, inflection.UNCOUNTABLES
+    )
+    valid = {
+        "cactus": {inflector.pluralize("cactus"), "cacti"},
+        "person": {"people"},
+        "status": {"statuses"},
+    }
+    invalid: typing.List[str] = []
+    stop = threading.Event()
+
+    def convert() -> None:
+        while not stop.is_set():
+            for word, plurals in valid.items():
+                plural = inflector.pluralize(word)
+                if plural not in plurals:
+                    invalid.append(plural)
+
+    threads = [threading.Thread(target=convert) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    try:
+        for _ in range(200):
+            inflector.irregular("cactus", "cacti")
+            del inflector.plurals[:2]
+            del inflector.singulars[:1]
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    assert [] == invalid
+
+
+def test_add_irregulars_matches_irregular_calls() -> None:
+    pairs = [("person", "people"), ("cow", "kine"), ("person", "persons")]
+    one_by_one = inflection.Inflector()
+    for singular, plural in pairs:
+        one_by_one.irregular(singular, plural)
+    at_once = inflection.Inflector()
+    at_once.add_irregulars(pairs)
+
+    assert one_by_one.plurals == at_once.plurals
+    assert one_by_one.singulars == at_once.singulars
+    assert ["persons", "Kine"] == at_once.pluralize_many(["person", "Cow"])
+
+
+def test_add_rules_in_one_step() -> None:
+    inflector = inflection.Inflector(
+        plurals=[(r"(?i)$", "s")],
+        singulars=[(r"(?i)s$", "")],
+    )
+    rules = inflector.plurals
+    version = getattr(rules, "version")
+
+    inflector.add_plural_rules([(r"(?i)(x)$", r"\1es"), (r"(?i)x$", "xen")])
+    inflector.add_singular_rules([(r"(?i)(x)es$", r"\1")])
+    inflector.add_uncountables(["fish", "sheep"])
+
+    assert version + 1 == getattr(rules, "version")
+    assert ["boxes", "cars", "fish"] == inflector.pluralize_many(
+        ["box", "car", "fish"]
+    )
+    assert ["box", "car", "sheep"] == inflector.singularize_many(
+        ["boxes", "cars", "sheep"]
+    )
+
+
+def test_add_rules_to_module_rules() -> None:
+    inflection.add_irregulars([("cactus", "cacti")])
+    inflection.add_plural_rules([(r"(?i)(gras)s$", r"\1ses")])
+    inflection.add_singular_rules([(r"(?i)(gras)ses$", r"\1s")])
+    inflection.add_uncountables(["gravel"])
+    try:
+        assert ["cacti", "grasses", "gravel"] == inflection.pluralize_many(
+            ["cactus", "grass", "gravel"]
+        )
+        assert "grass" == inflection.singularize("grasses")
+    finally:
+        inflection.UNCOUNTABLES.remove("gravel")
+        del inflection.PLURALS[:3]
+        del inflection.SINGULARS[:2]
+
+
+def _apply_rules(rules: inflection.RegexReplaceList, word: str) -> str:
+    for rule, replacement in rules:
+        if re.search(rule, word):
+            return re.sub(rule, replacement, word)
+    return word
+
+
+@pytest.mark.parametrize(
+    "word",
+    [
+        "person", "Person", "PERSON", "salesperson", "CamelPerson", "people",
+        "cow", "Cow", "COW", "kine", "KINE", "cows", "ox", "Ox", "oxen",
+        "person\n", "Ærperson", "cow_Ox", "sheep", "per\u017fon",
+        "Ærcow", "\u212aINE", "\u0130ox", "\u017fheep",
+    ]
+)
+def test_irregular_lookup_matches_rules(word: str) -> None:
+    inflector = inflection.Inflector(
+        plurals=[(r"(?i)$", "s")],
+        singulars=[(r"(?i)s$", "")],
+    )
+    inflector.add_irregulars([
+        ("person", "people"), ("cow", "kine"), ("ox", "oxen"), ("OX", "OXEN")
+    ])
+    inflector.add_plural_rules([(r"(?i)(sheep)$", r"\1")])
+
+    assert _apply_rules(inflector.plurals, word) == inflector.pluralize(word)
+    assert _apply_rules(inflector.singulars, word) == (
+        inflector.singularize(word)
+    )
+    assert [_apply_rules(inflector.plurals, word)] == (
+        inflector.pluralize_many([word])
+    )
+
+
+def test_rules_added_after_irregulars_take_precedence() -> None:
+    inflector = inflection.Inflector(plurals=[(r"(?i)$", "s")])
+    inflector.irregular("person", "people")
+    inflector.add_plural_rules([(r"(?i)(sales)person$", r"\1folk")])
+
+    assert ["salesfolk", "people"] == inflector.pluralize_many(
+        ["salesperson", "person"]
+    )
+
+
+def test_transform_keys_copies_nested_structures() -> None:
+    payload = {
+        "deviceType": [{"deviceId": 1, 2: "two"}, [{"macAddress": None}]],
+        "ownerName": ("notA", {"dictKey": 1}),
+    }
+
+    assert {
+        "device_type": [{"device_id": 1, 2: "two"}, [{"mac_address": None}]],
+        "owner_name": ("notA", {"dictKey": 1}),
+    } == inflection.underscore_keys(payload)
+    assert "deviceType" in payload
+
+
+def test_transform_keys_of_deeply_nested_payload() -> None:
+    payload: typing.Dict[str, object] = {}
+    inner = payload
+    for _ in range(10000):
+        inner["nextItem"] = [{}]
+        inner = typing.cast(typing.List[typing.Dict[str, object]],
+                            inner["nextItem"])[0]
+
+    result = inflection.underscore_keys(payload)
+    for _ in range(10000):
+        result = typing.cast(typing.List[typing.Dict[str, object]],
+                             result["next_item"])[0]
+    assert {} == result
+
+
+def test_transform_keys_converts_each_key_once() -> None:
+    calls = []
+
+    def shout(key: str) -> str:
+        calls.append(key)
+        return key.upper()
+
+    payload = [{"a": 1, "b": 2}] * 1000
+    assert [{"A": 1, "B": 2}] * 1000 == inflection.transform_keys(
+        payload, shout
+    )
+    assert [{"A": 1}] == inflection.transform_keys([{"a": 1}], shout)
+    assert ["a", "b"] == calls
+
+    inflection.transform_keys({"c": 1, "d": 2, "e": 3}, shout, memo_size=2)
+    assert ["a", "b", "c", "d", "e"] == calls
+
+
+def test_transform_keys_follows_rule_changes() -> None:
+    assert {"cactus": 1} == inflection.transform_keys(
+        {"cactus": 1}, inflection.pluralize
+    )
+    inflection.add_irregulars([("cactus", "cacti")])
+    try:
+        assert {"cacti": 1} == inflection.transform_keys(
+            {"cactus": 1}, inflection.pluralize
+        )
+    finally:
+        del inflection.PLURALS[:2]
+        del inflection.SINGULARS[:1]
+
+
+def test_transform_keys_follows_rule_changes_of_an_inflector() -> None:
+    inflector = inflection.Inflector(plurals=[(r"(?i)$", "s")])
+    function = inflector.pluralize
+    partial = functools.partial(inflector.pluralize)
+    assert {"oxs": 1} == inflection.transform_keys({"ox": 1}, function)
+    assert {"oxs": 1} == inflection.transform_keys({"ox": 1}, partial)
+    inflector.irregular("ox", "oxen")
+    assert {"oxen": 1} == inflection.transform_keys({"ox": 1}, function)
+    assert {"oxen": 1} == inflection.transform_keys({"ox": 1}, partial)
+
+
+def test_transform_keys_remembers_keys_of_inflector_methods() -> None:
+    calls = []
+
+    class Inflector(inflection.Inflector):
+        def pluralize(self, word: str) -> str:
+            calls.append(word)
+            return super().pluralize(word)
+
+    inflector = Inflector(plurals=[(r"(?i)$", "s")])
+    # Each access to inflector.pluralize makes a new bound method.
+    for _ in range(2):
+        assert {"oxs": 1} == (
+            inflection.transform_keys({"ox": 1}, inflector.pluralize)
+        )
+    assert ["ox"] == calls
+
+
+def test_camelize_keys() -> None:
+    payload = {"device_type": {"device_id": 1}}
+    assert {"DeviceType": {"DeviceId": 1}} == inflection.camelize_keys(payload)
+    assert {"deviceType": {"deviceId": 1}} == inflection.camelize_keys(
+        payload, False
+    )
+
+
+def test_bulk_camelize_uses_the_c_extension(
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    if not inflection._SPEEDUPS:
+        pytest.skip("the C extension is not used")
+    calls = []
+    camelize = inflection._speedups.camelize
+
+    def spy(string: str, uppercase_first_letter: bool = True) -> str:
+        calls.append(string)
+        result = camelize(string, uppercase_first_letter)
+        assert result is not None
+        return result
+
+    monkeypatch.setattr(inflection._speedups, "camelize", spy)
+    assert ["SpyFirst"] == inflection.camelize_many(["spy_first"])
+    assert {"spySecond": 1} == (
+        inflection.camelize_keys({"spy_second": 1}, False)
+    )
+    assert ["spy_first", "spy_second"] == calls
+
+
+@pytest.mark.parametrize(
+    "singular,plural",
+    SINGULAR_TO_PLURAL + (("person\n", "people\n"), ("Ærperson", "Ærpeople"))
+)
+def test_explain_matches_conversions(singular: str, plural: str) -> None:
+    for word, function in [(singular, "pluralize"), (plural, "singularize")]:
+        explanation = inflection.explain(word, function)
+        assert getattr(inflection, function)(word) == explanation.result
+        if explanation.winner is not None:
+            assert explanation.winner == explanation.tried[-1]
+
+
+def test_explain() -> None:
+    explanation = inflection.explain("Person")
+    assert "People" == explanation.result
+    assert [("(?i)(p)erson$", "\\1eople")] == explanation.tried
+    assert explanation.tried[0] == explanation.winner
+
+    assert inflection.explain("sheep").uncountable
+    assert (
+        "word", "word", False, [], None
+    ) == inflection.Inflector().explain("word", "singularize")
+    with pytest.raises(ValueError):
+        inflection.explain("word", "tableize")
+
+
+def test_rule_stats() -> None:
+    inflector = inflection.Inflector(
+        plurals=[(r"(?i)x$", "xes"), (r"(?i)$", "s")],
+        uncountables=["sheep"],
+    )
+    inflector.irregular("person", "people")
+    assert [] == inflector.rule_stats()
+
+    inflector.enable_stats()
+    assert ["boxes", "cars", "people", "sheep", "cars"] == (
+        inflector.pluralize_many(["box", "car", "person", "sheep", "car"])
+    )
+    assert "boxs" == inflector.singularize("boxs")
+    stats = {
+        (stat.rules, stat.rule): (stat.evaluations, stat.matches)
+        for stat in inflector.rule_stats()
+    }
+    assert {
+        ("plurals", "(?i)x$"): (1, 1),
+        ("plurals", "(?i)$"): (2, 2),
+        ("plurals", "(?i)(p)erson$"): (1, 1),
+    } == stats
+    assert all(stat.time >= 0 for stat in inflector.rule_stats())
+
+    inflector.stats_clear()
+    assert [] == inflector.rule_stats()
+    inflector.disable_stats()
+    inflector.pluralize("car")
+    assert [] == inflector.rule_stats()
+
+
+def test_rule_stats_of_module_rules() -> None:
+    inflection.enable_stats()
+    try:
+        assert "octopi" == inflection.pluralize("octopus")
+        assert "octopus" == inflection.singularize("octopi")
+        assert {
+            ("plurals", "(?i)(octop|vir)us$", 1),
+            ("singulars", "(?i)(octop|vir)(us|i)$", 1),
+        } <= {
+            (stat.rules, stat.rule, stat.matches)
+            for stat in inflection.rule_stats()
+        }
+    finally:
+        inflection.disable_stats()
+    assert [] == inflection.rule_stats()
+
+
+def test_lazy_patterns_replace_themselves(
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pattern = inflection._lazy_compile("_TEST_PATTERN", "a+")
+    monkeypatch.setattr(inflection, "_TEST_PATTERN", pattern, raising=False)
+    assert "b-b" == pattern.sub("-", "baab")
+    assert re.compile("a+") is getattr(inflection, "_TEST_PATTERN")
+
+
+def test_module_patterns_are_compiled_on_first_use() -> None:
+    # A fresh copy of the module, whose patterns have not been used yet.
+    spec = importlib.util.spec_from_file_location(
+        "fresh_inflection", inflection.__file__
+    )
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    names = [
+        name for name, value in vars(module).items()
+        if isinstance(value, module._LazyPattern)
+    ]
+    assert len(names) > 5
+    for name in names:
+        getattr(module, name).pattern
+        assert isinstance(getattr(module, name), re.Pattern)
+
+
+def _is_compiled(rule: object) -> bool:
+    # Read the slot directly, as hasattr() would compile the rule.
+    try:
+        type(rule).__dict__["pattern"].__get__(rule)
+    except AttributeError:
+        return False
+    return True
+
+
+def test_rules_are_compiled_when_first_tried() -> None:
+    inflector = inflection.Inflector(
+        plurals=[(r"(?i)x$", "xes"), (r"(?i)$", "s")]
+    )
+    assert "cars" == inflector.pluralize("car")
+    rules = inflector._rules().plurals.all_rules()
+    assert [False, True] == [_is_compiled(rule) for rule in rules]
+
+    inflector.freeze()
+    rules = inflector._rules().plurals.all_rules()
+    assert [True, True] == [_is_compiled(rule) for rule in rules]
+
+
+def _large_inflector() -> inflection.Inflector:
+    inflector = inflection.Inflector(
+        inflection.PLURALS, inflection.SINGULARS, inflection.UNCOUNTABLES
+    )
+    inflector.add_irregulars([
+        ("".join(letters), "".join(letters) + "en")
+        for letters in itertools.product("bdk", "aeo", "lmn")
+    ])
+    return inflector
+
+
+def test_dumps_and_loads() -> None:
+    inflector = _large_inflector()
+    words = ["bal", "balen", "Kon", "octopus", "sheep", "person", "Ærperson"]
+    plurals = inflector.pluralize_many(words)
+    singulars = inflector.singularize_many(words)
+
+    loaded = inflection.Inflector.loads(inflector.dumps())
+    snapshot = loaded._snapshot
+    assert snapshot is not None
+    assert not any(
+        _is_compiled(rule) for rule in snapshot.plurals.regular.values()
+    )
+    assert plurals == loaded.pluralize_many(words)
+    assert singulars == [loaded.singularize(word) for word in words]
+    assert snapshot is loaded._rules()
+    assert inflector.plurals == loaded.plurals
+
+    loaded.irregular("bal", "bali")
+    assert "bali" == loaded.pluralize("bal")
+    assert "balen" == inflector.pluralize("bal")
+
+
+def test_loads_rejects_other_data(monkeypatch: pytest.MonkeyPatch) -> None:
+    data = inflection.Inflector().dumps()
+    with pytest.raises(ValueError, match="not inflection rules"):
+        inflection.Inflector.loads(b"something else")
+    monkeypatch.setattr(inflection, "__version__", "0.0.1")
+    with pytest.raises(ValueError, match="saved by inflection"):
+        inflection.Inflector.loads(data)
+
+
+def test_dump_and_load_rules(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for name in ["PLURALS", "SINGULARS", "UNCOUNTABLES"]:
+        monkeypatch.setattr(inflection, name, getattr(inflection, name))
+    path = tmp_path / "rules.bin"
+    _large_inflector().dump(path)
+    assert "kine" == inflection.Inflector.load(path).pluralize("cow")
+
+    inflection.load_rules(path)
+    assert "dolen" == inflection.pluralize("dol")
+    assert "dol" == inflection.singularize("dolen")
+    inflection.dump_rules(path)
+    assert "dolen" == inflection.Inflector.load(path).pluralize("dol")